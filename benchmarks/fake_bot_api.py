@@ -0,0 +1,172 @@
+"""Local stand-in for the Telegram Bot API used by the load test.
+
+Speaks just enough HTTP/1.1 (keep-alive, Content-Length bodies) for the
+bot's httpx client and answers getMe, getUpdates, sendMessage,
+editMessageText and the few housekeeping calls made during startup.
+Latency is measured from when an update is queued until the first
+message the bot sends back to that chat.
+"""
+import asyncio
+import json
+import time
+from collections import defaultdict, deque
+from typing import Deque, Dict, List, Tuple
+from urllib.parse import parse_qsl
+
+BOT_USER = {
+    'id': 1000000,
+    'is_bot': True,
+    'first_name': 'LoadTestBot',
+    'username': 'load_test_bot'
+}
+
+
+class FakeBotAPI:
+    def __init__(self, host: str = '127.0.0.1', port: int = 0):
+        self.host = host
+        self.port = port
+        self.server = None
+        self.updates: Deque[Dict] = deque()
+        self.new_updates = asyncio.Event()
+        self.next_update_id = 1
+        self.next_message_id = 1
+        self.pending: Dict[int, Deque[Tuple[int, float]]] = defaultdict(deque)  # chat_id -> (update_id, queued at)
+        self.latencies: List[float] = []
+        self.completed_at: List[float] = []
+        self.calls: Dict[str, int] = defaultdict(int)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/bot"
+
+    @property
+    def outstanding(self) -> int:
+        return sum(len(queue) for queue in self.pending.values())
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    def queue_command(self, user_id: int, text: str) -> int:
+        """Queue a private-chat command message from a simulated user"""
+        update_id = self.next_update_id
+        self.next_update_id += 1
+        command = text.split(' ', 1)[0]
+
+        self.updates.append({
+            'update_id': update_id,
+            'message': {
+                'message_id': update_id,
+                'date': int(time.time()),
+                'chat': {'id': user_id, 'type': 'private'},
+                'from': {'id': user_id, 'is_bot': False, 'first_name': f"user{user_id}"},
+                'text': text,
+                'entities': [{'type': 'bot_command', 'offset': 0, 'length': len(command)}]
+            }
+        })
+        self.pending[user_id].append((update_id, time.perf_counter()))
+        self.new_updates.set()
+        return update_id
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                path = request_line.decode('latin-1').split(' ')[1]
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+                params = self.parse_params(headers.get('content-type', ''), body)
+
+                result = await self.dispatch(path.rsplit('/', 1)[-1], params)
+                payload = json.dumps({'ok': True, 'result': result}).encode('utf-8')
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\n"
+                    b"Content-Type: application/json\r\n"
+                    b"Content-Length: " + str(len(payload)).encode() + b"\r\n\r\n" + payload
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            # Client went away or the server is shutting down
+            pass
+        finally:
+            writer.close()
+
+    def parse_params(self, content_type: str, body: bytes) -> Dict:
+        """Decode JSON or form bodies; form values are JSON-encoded by the bot"""
+        if not body:
+            return {}
+        if content_type.startswith('application/json'):
+            return json.loads(body)
+
+        params = {}
+        for key, value in parse_qsl(body.decode('utf-8')):
+            try:
+                params[key] = json.loads(value)
+            except ValueError:
+                params[key] = value
+        return params
+
+    async def dispatch(self, method: str, params: Dict):
+        self.calls[method] += 1
+
+        if method == 'getUpdates':
+            return await self.get_updates(params)
+        if method == 'getMe':
+            return BOT_USER
+        if method in ('sendMessage', 'editMessageText'):
+            return self.record_reply(method, params)
+        # deleteWebhook, sendChatAction, ...
+        return True
+
+    async def get_updates(self, params: Dict) -> List[Dict]:
+        offset = int(params.get('offset') or 0)
+        limit = int(params.get('limit') or 100)
+
+        # Updates below the offset were confirmed by the bot
+        while self.updates and self.updates[0]['update_id'] < offset:
+            self.updates.popleft()
+
+        if not self.updates:
+            self.new_updates.clear()
+            try:
+                await asyncio.wait_for(self.new_updates.wait(), timeout=float(params.get('timeout') or 0))
+            except asyncio.TimeoutError:
+                return []
+
+        return [self.updates[i] for i in range(min(limit, len(self.updates)))]
+
+    def record_reply(self, method: str, params: Dict) -> Dict:
+        chat_id = int(params['chat_id'])
+        queue = self.pending.get(chat_id)
+        if method == 'sendMessage' and queue:
+            _, queued_at = queue.popleft()
+            now = time.perf_counter()
+            self.latencies.append(now - queued_at)
+            self.completed_at.append(now)
+
+        message_id = params.get('message_id')
+        if message_id is None:
+            message_id = self.next_message_id
+            self.next_message_id += 1
+
+        return {
+            'message_id': int(message_id),
+            'date': int(time.time()),
+            'chat': {'id': chat_id, 'type': 'private'},
+            'from': BOT_USER,
+            'text': params.get('text', '')
+        }
@@ -0,0 +1,214 @@
+"""Load test for RaspberryPiBot against a local fake Bot API.
+
+Runs the real Application and handlers from main.py, pointed at
+benchmarks.fake_bot_api, and replays a mix of commands from many
+simulated users at a fixed rate. Run from the repository root:
+
+    python -m benchmarks.load_test --users 20 --rate 10 --duration 60
+    python -m benchmarks.load_test --mix status=5,temp=3,cmd=2 --cmd "uptime"
+
+Reports throughput, end-to-end latency percentiles, event-loop lag and
+RSS over time. Rate limiting is disabled unless --rate-limit is given.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import random
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+import psutil
+
+import main
+from benchmarks.fake_bot_api import FakeBotAPI
+from modules.command_scheduler import CommandScheduler
+from modules.runtime_config import config_manager
+
+COMMANDS = {
+    'status': '/status',
+    'system': '/system',
+    'temp': '/temp',
+    'cmd': '/cmd',
+}
+
+
+def parse_mix(text: str) -> Dict[str, int]:
+    """Parse 'status=4,temp=1' into command weights"""
+    mix = {}
+    for item in text.split(','):
+        name, _, weight = item.partition('=')
+        if name not in COMMANDS:
+            raise argparse.ArgumentTypeError(f"Unknown command '{name}', choose from {', '.join(COMMANDS)}")
+        mix[name] = int(weight or 1)
+    return mix
+
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def format_ms(value: Optional[float]) -> str:
+    return f"{value * 1000:8.1f}" if value is not None else "       -"
+
+
+async def measure_loop_lag(samples: List[float], interval: float = 0.05):
+    """Record how late the event loop wakes up from a short sleep"""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        samples.append(max(0.0, loop.time() - start - interval))
+
+
+async def sample_rss(samples: List[tuple], started: float, interval: float):
+    process = psutil.Process(os.getpid())
+    while True:
+        samples.append((time.perf_counter() - started, process.memory_info().rss))
+        await asyncio.sleep(interval)
+
+
+async def generate_load(api: FakeBotAPI, args, mix: Dict[str, int]):
+    """Open-loop generator: queue updates at a fixed rate regardless of replies"""
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    user_ids = [args.first_user_id + i for i in range(args.users)]
+    total = int(args.rate * args.duration)
+    started = time.perf_counter()
+
+    for i in range(total):
+        delay = started + i / args.rate - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        name = random.choices(names, weights)[0]
+        text = COMMANDS[name]
+        if name == 'cmd':
+            text += f" {args.cmd}"
+        api.queue_command(random.choice(user_ids), text)
+
+    return total
+
+
+async def run_load_test(args):
+    mix = parse_mix(args.mix)
+    api = FakeBotAPI()
+    await api.start()
+
+    # Simulated users must pass the real authorization and rate limit checks
+    config_manager.current = config_manager.current._replace(
+        authorized_users=frozenset(args.first_user_id + i for i in range(args.users)),
+        rate_limit=args.rate_limit or 10**9
+    )
+
+    bot = main.RaspberryPiBot()
+    main.CONFIG_WATCH_INTERVAL = 0  # Keep the overridden settings for the whole run
+    # Keep load-test schedules and metrics out of the real data directory
+    data_dir = tempfile.mkdtemp(prefix='load-test-')
+    bot.scheduler = CommandScheduler(os.path.join(data_dir, 'schedules.json'))
+    bot.metrics_store.directory = os.path.join(data_dir, 'metrics')
+
+    builder = (
+        main.Application.builder()
+        .token('123456:LOADTEST')
+        .base_url(api.base_url)
+        .connection_pool_size(args.pool_size)
+        .concurrent_updates(args.concurrent_updates)
+    )
+    application = bot.build_application(builder)
+
+    lag_samples: List[float] = []
+    rss_samples: List[tuple] = []
+    started = time.perf_counter()
+
+    async with application:
+        await application.start()
+        await application.updater.start_polling(poll_interval=0, timeout=1)
+
+        monitors = [
+            asyncio.create_task(measure_loop_lag(lag_samples)),
+            asyncio.create_task(sample_rss(rss_samples, started, args.rss_interval)),
+        ]
+
+        sent = await generate_load(api, args, mix)
+        load_ended = time.perf_counter()
+
+        # Let in-flight updates finish
+        drain_deadline = time.perf_counter() + args.drain_timeout
+        while api.outstanding and time.perf_counter() < drain_deadline:
+            await asyncio.sleep(0.1)
+
+        for task in monitors:
+            task.cancel()
+
+        await application.updater.stop()
+        await application.stop()
+
+    await api.stop()
+
+    report(args, mix, api, sent, started, load_ended, lag_samples, rss_samples)
+
+
+def report(args, mix, api: FakeBotAPI, sent: int, started: float, load_ended: float,
+           lag_samples: List[float], rss_samples: List[tuple]):
+    completed = len(api.latencies)
+    elapsed = (api.completed_at[-1] if api.completed_at else load_ended) - started
+
+    print("\n📊 Load test results")
+    print(f"Users: {args.users}  Target rate: {args.rate}/s  Duration: {args.duration}s  "
+          f"Concurrent updates: {args.concurrent_updates}")
+    print(f"Mix: {', '.join(f'{name}={weight}' for name, weight in mix.items())}")
+    print(f"\nSent: {sent}  Completed: {completed}  Unanswered: {api.outstanding}")
+    print(f"Throughput: {completed / elapsed if elapsed else 0:.1f} updates/s")
+
+    print(f"\n{'':16}{'p50':>8}{'p90':>8}{'p99':>8}{'max':>8}  (ms)")
+    for name, values in (('Latency', api.latencies), ('Event-loop lag', lag_samples)):
+        row = ''.join(format_ms(percentile(values, pct)) for pct in (50, 90, 99))
+        print(f"{name:<16}{row}{format_ms(max(values) if values else None)}")
+
+    print("\nRSS over time:")
+    for offset, rss in rss_samples:
+        print(f"  {offset:6.1f}s  {rss / 1024**2:7.1f} MB")
+
+    print("\nAPI calls: " + ', '.join(f"{method}={count}" for method, count in sorted(api.calls.items())))
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--users', type=int, default=10, help="Number of simulated user IDs")
+    parser.add_argument('--rate', type=float, default=5.0, help="Updates per second")
+    parser.add_argument('--duration', type=float, default=30.0, help="Seconds of load")
+    parser.add_argument('--mix', default='status=4,system=1,temp=2,cmd=3',
+                        help="Command weights, e.g. status=4,system=1,temp=2,cmd=3")
+    parser.add_argument('--cmd', default='uptime', help="Command line used for /cmd")
+    parser.add_argument('--concurrent-updates', type=int, default=1,
+                        help="Updates processed concurrently by the Application")
+    parser.add_argument('--pool-size', type=int, default=32, help="HTTP connection pool size")
+    parser.add_argument('--rate-limit', type=int, default=0,
+                        help="Per-user commands per minute (0 disables the limit)")
+    parser.add_argument('--first-user-id', type=int, default=100000)
+    parser.add_argument('--rss-interval', type=float, default=5.0, help="Seconds between RSS samples")
+    parser.add_argument('--drain-timeout', type=float, default=30.0,
+                        help="Seconds to wait for in-flight updates after load ends")
+    args = parser.parse_args()
+
+    # main configures logs/bot.log on import; log this run to stderr only
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, logging.FileHandler):
+            root.removeHandler(handler)
+            handler.close()
+
+    # Per-request logging from httpx would dominate the run
+    logging.getLogger('httpx').setLevel(logging.WARNING)
+    logging.getLogger('apscheduler').setLevel(logging.WARNING)
+
+    asyncio.run(run_load_test(args))
+
+
+if __name__ == '__main__':
+    main_cli()
@@ -0,0 +1,131 @@
+"""Bytes per retained snapshot: legacy dicts vs. snapshot types.
+
+Run from the repository root:
+
+    python -m benchmarks.snapshot_memory
+"""
+import random
+import time
+import tracemalloc
+
+from modules.snapshots import CpuSnapshot, MemorySnapshot, ThermalSnapshot
+
+SAMPLES = 10000
+CORES = 4
+
+
+def legacy_cpu():
+    """CPU reading in the old dict form"""
+    overall = random.uniform(0, 100)
+    return {
+        'overall': overall,
+        'per_core': [random.uniform(0, 100) for _ in range(CORES)],
+        'cores': CORES,
+        'frequency': {
+            'current': random.uniform(600, 1500),
+            'min': 600.0,
+            'max': 1500.0
+        },
+        'warning': overall >= 80.0
+    }
+
+
+def snapshot_cpu():
+    overall = random.uniform(0, 100)
+    return CpuSnapshot(
+        timestamp=time.time(),
+        overall=overall,
+        per_core=tuple(random.uniform(0, 100) for _ in range(CORES)),
+        cores=CORES,
+        freq_current=random.uniform(600, 1500),
+        freq_min=600.0,
+        freq_max=1500.0,
+        warning=overall >= 80.0
+    )
+
+
+def legacy_memory():
+    percent = random.uniform(0, 100)
+    return {
+        'total': 4 * 1024**3,
+        'available': random.randrange(1024**3),
+        'used': random.randrange(1024**3),
+        'free': random.randrange(1024**3),
+        'percent': percent,
+        'swap_total': 100 * 1024**2,
+        'swap_used': random.randrange(1024**2),
+        'swap_free': random.randrange(1024**2),
+        'swap_percent': random.uniform(0, 100),
+        'warning': percent >= 85.0
+    }
+
+
+def snapshot_memory():
+    percent = random.uniform(0, 100)
+    return MemorySnapshot(
+        timestamp=time.time(),
+        total=4 * 1024**3,
+        available=random.randrange(1024**3),
+        used=random.randrange(1024**3),
+        free=random.randrange(1024**3),
+        percent=percent,
+        swap_total=100 * 1024**2,
+        swap_used=random.randrange(1024**2),
+        swap_free=random.randrange(1024**2),
+        swap_percent=random.uniform(0, 100),
+        warning=percent >= 85.0
+    )
+
+
+def legacy_thermal():
+    cpu_temp = random.uniform(40, 85)
+    return {
+        'cpu_temp': cpu_temp,
+        'gpu_temp': cpu_temp,
+        'status': 'normal',
+        'warning': cpu_temp >= 70.0,
+        'critical': cpu_temp >= 80.0,
+        'trend': random.uniform(-1, 1),
+        'time_to_critical': None
+    }
+
+
+def snapshot_thermal():
+    cpu_temp = random.uniform(40, 85)
+    return ThermalSnapshot(
+        timestamp=time.time(),
+        cpu_temp=cpu_temp,
+        gpu_temp=cpu_temp,
+        status='normal',
+        warning=cpu_temp >= 70.0,
+        critical=cpu_temp >= 80.0,
+        trend=random.uniform(-1, 1)
+    )
+
+
+def measure(factory) -> float:
+    """Average bytes allocated per retained object"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    retained = [factory() for _ in range(SAMPLES)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # The list itself holds one pointer per sample
+    return (after - before) / len(retained) - 8
+
+
+def main():
+    print(f"Bytes per retained snapshot ({SAMPLES} samples, {CORES} cores)\n")
+    print(f"{'type':<10}{'dict':>10}{'snapshot':>10}{'saved':>8}")
+    for name, legacy, snapshot in (
+        ('cpu', legacy_cpu, snapshot_cpu),
+        ('memory', legacy_memory, snapshot_memory),
+        ('thermal', legacy_thermal, snapshot_thermal),
+    ):
+        before = measure(legacy)
+        after = measure(snapshot)
+        print(f"{name:<10}{before:>10.0f}{after:>10.0f}{1 - after / before:>8.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+"""End-to-end check of the systemd watchdog integration.
+
+Runs the real Application from main.py against benchmarks.fake_bot_api,
+with NOTIFY_SOCKET pointed at a local datagram socket standing in for
+systemd, and walks through the health states the watchdog must tell
+apart. Run from the repository root:
+
+    python -m benchmarks.watchdog_check
+
+Exits non-zero if any check fails.
+"""
+import asyncio
+import logging
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from typing import List
+
+WATCHDOG_USEC = 1000000  # 0.5 s between pings
+SAMPLE_INTERVAL = 0.2
+SAMPLER_TIMEOUT = 1.0
+MAX_LOOP_LAG = 1.0
+
+
+class FakeNotifySocket:
+    """Datagram socket that records sd_notify messages"""
+
+    def __init__(self):
+        self.path = os.path.join(tempfile.mkdtemp(prefix='watchdog-check-'), 'notify')
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.socket.bind(self.path)
+        self.socket.setblocking(False)
+        self.messages: List[str] = []
+
+    def drain(self) -> List[str]:
+        """Return messages received since the last drain"""
+        received = []
+        while True:
+            try:
+                received.append(self.socket.recv(4096).decode('utf-8'))
+            except BlockingIOError:
+                break
+        self.messages.extend(received)
+        return received
+
+
+def count_pings(messages: List[str]) -> int:
+    return sum('WATCHDOG=1' in message.split('\n') for message in messages)
+
+
+async def run_checks() -> List[tuple]:
+    notify = FakeNotifySocket()
+    os.environ['NOTIFY_SOCKET'] = notify.path
+    os.environ['WATCHDOG_USEC'] = str(WATCHDOG_USEC)
+    os.environ.pop('WATCHDOG_PID', None)
+
+    # Imported late: the notifier reads NOTIFY_SOCKET when the bot is created
+    import main
+    from benchmarks.fake_bot_api import FakeBotAPI
+    from modules.command_scheduler import CommandScheduler
+    from modules.systemd_notify import HealthMonitor
+
+    api = FakeBotAPI()
+    await api.start()
+
+    bot = main.RaspberryPiBot()
+    main.CONFIG_WATCH_INTERVAL = 0
+    main.METRICS_SAMPLE_INTERVAL = SAMPLE_INTERVAL
+    data_dir = tempfile.mkdtemp(prefix='watchdog-check-')
+    bot.scheduler = CommandScheduler(os.path.join(data_dir, 'schedules.json'))
+    bot.metrics_store.directory = os.path.join(data_dir, 'metrics')
+    bot.health = HealthMonitor(sampler_timeout=SAMPLER_TIMEOUT, max_loop_lag=MAX_LOOP_LAG)
+
+    application = bot.build_application(
+        main.Application.builder().token('123456:WATCHDOG').base_url(api.base_url)
+    )
+
+    results = []
+    sample = bot.metrics_store.collect_sample
+    release = threading.Event()
+
+    async def observe(seconds: float) -> List[str]:
+        notify.drain()
+        await asyncio.sleep(seconds)
+        return notify.drain()
+
+    async with application:
+        await application.start()
+        await application.updater.start_polling(poll_interval=0, timeout=1)
+
+        messages = await observe(2.0)
+        results.append(("READY=1 sent after startup", any('READY=1' in m for m in notify.messages)))
+        results.append(("Pings while healthy", count_pings(messages) >= 2))
+        results.append(("STATUS reports lag and queue",
+                        any('STATUS=loop lag' in m and 'updates queued' in m for m in messages)))
+
+        # A sampler that keeps failing is not a reason to restart
+        def failing_sample():
+            raise FileNotFoundError("vcgencmd")
+        bot.metrics_store.collect_sample = failing_sample
+        messages = await observe(SAMPLER_TIMEOUT * 3)
+        results.append(("Pings continue while the sampler fails", count_pings(messages) >= 3))
+
+        # A stalled event loop skips the next ping
+        bot.metrics_store.collect_sample = sample
+        await asyncio.sleep(1.0)
+        notify.drain()
+        time.sleep(MAX_LOOP_LAG * 2)
+        messages = await observe(1.0)
+        results.append(("Unhealthy status after a loop stall",
+                        any('Unhealthy: event loop lag' in m for m in messages)))
+
+        # A hung sampler stops the pings
+        bot.metrics_store.collect_sample = lambda: release.wait()
+        await asyncio.sleep(SAMPLER_TIMEOUT + 1.0)
+        messages = await observe(1.5)
+        results.append(("No pings while the sampler hangs", count_pings(messages) == 0))
+        results.append(("Unhealthy status names the sampler",
+                        any('Unhealthy: sampler stalled' in m for m in messages)))
+        release.set()
+
+        await application.updater.stop()
+        await application.stop()
+        await bot.post_stop(application)
+
+    await api.stop()
+    await asyncio.sleep(0.1)
+    notify.drain()
+    results.append(("STOPPING=1 sent on shutdown", 'STOPPING=1' in notify.messages[-1]))
+    return results
+
+
+def main_cli():
+    # Configured before main is imported, so main's logs/bot.log handler is never added
+    logging.basicConfig(level=logging.WARNING)
+    # Skipped runs of the deliberately hung sampler and httpx requests are expected
+    logging.getLogger('apscheduler').setLevel(logging.ERROR)
+    logging.getLogger('httpx').setLevel(logging.WARNING)
+
+    results = asyncio.run(run_checks())
+
+    print("\n🐶 Watchdog check")
+    for name, passed in results:
+        print(f"{'✅' if passed else '❌'} {name}")
+
+    sys.exit(0 if all(passed for _, passed in results) else 1)
+
+
+if __name__ == '__main__':
+    main_cli()
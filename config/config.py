@@ -19,15 +19,82 @@ ALLOWED_COMMANDS = [
     'ping', 'wget', 'curl', 'git', 'pip', 'python3'
 ]
 
+# Resource ceilings for /cmd executions (None disables the check).
+# Entries in COMMAND_RESOURCE_LIMITS override the defaults per base command.
+COMMAND_CPU_LIMIT = None  # CPU seconds (user + system), summed over the command and its children
+COMMAND_MEMORY_LIMIT = None  # Peak resident memory in MB, summed over the command and its children
+COMMAND_RESOURCE_LIMITS = {
+    # 'python3': {'cpu': 10, 'memory': 200},
+}
+
+# Batched commands (/batch, /run)
+BATCH_MAX_COMMANDS = 10
+BATCH_CONCURRENCY = 3  # Commands of one batch running at the same time
+SAVED_BATCHES = {
+    'healthcheck': ['uptime', 'free -h', 'df -h', 'systemctl --failed'],
+    'network': ['ping -c 2 1.1.1.1', 'curl -sI https://api.telegram.org'],
+}
+
 # System monitoring settings
 TEMP_WARNING_THRESHOLD = 70.0  # Celsius
 TEMP_CRITICAL_THRESHOLD = 80.0  # Celsius
 CPU_WARNING_THRESHOLD = 80.0   # Percentage
 MEMORY_WARNING_THRESHOLD = 85.0  # Percentage
 
+# Predictive thermal alerts and adaptive sampling
+TEMP_PREDICT_HORIZON = 300  # Alert when critical is expected within this many seconds
+TEMP_TREND_WINDOW = 900  # Seconds of samples used to estimate the trend
+TEMP_TREND_MIN_SAMPLES = 3
+TEMP_RISING_RATE = 0.5  # Celsius per minute considered "rising"
+TEMP_SAMPLE_FAST = 15  # Seconds between checks while rising or near thresholds
+TEMP_SAMPLE_NORMAL = 60
+TEMP_SAMPLE_SLOW = 300  # Seconds between checks while cool and stable
+
 # Logging configuration
 LOG_LEVEL = 'INFO'
 LOG_FILE = 'logs/bot.log'
 
 # Rate limiting (commands per minute per user)
 RATE_LIMIT = 10
+
+# Metrics history (/export)
+METRICS_DIR = 'data/metrics'
+METRICS_SAMPLE_INTERVAL = 60  # Seconds between samples, 0 disables recording
+METRICS_RETENTION_DAYS = 7
+METRICS_EXPORT_MAX_POINTS = 2000  # Exports are downsampled above this many rows
+
+# Hot reload: AUTHORIZED_USERS, ALLOWED_COMMANDS, the warning/critical
+# thresholds and RATE_LIMIT are re-read on /reload or when this file changes.
+# Other settings still need a restart.
+CONFIG_WATCH_INTERVAL = 10  # Seconds between file checks, 0 disables
+
+# systemd watchdog (WatchdogSec= in pi-telegram-bot.service sets the ping interval)
+WATCHDOG_MAX_LOOP_LAG = 5.0  # Seconds the event loop may stall before pings stop
+WATCHDOG_SAMPLER_MISSES = 3  # Missed metrics samples before pings stop
+
+# Log viewer (/logs) - only these files can be read
+ALLOWED_LOG_FILES = {
+    'bot': LOG_FILE,
+    'syslog': '/var/log/syslog',
+    'messages': '/var/log/messages',
+    'auth': '/var/log/auth.log',
+    'kern': '/var/log/kern.log',
+    'daemon': '/var/log/daemon.log',
+}
+LOG_UNIT_SOURCE = '/var/log/syslog'  # File searched when a unit name is given
+LOG_DEFAULT_LINES = 20
+LOG_MAX_LINES = 200
+LOG_MAX_SCAN_BYTES = 8 * 1024 * 1024  # Never look further back than this
+LOG_READ_BLOCK_SIZE = 64 * 1024
+
+# Scheduled commands (/schedule)
+SCHEDULES_FILE = 'data/schedules.json'
+SCHEDULE_MIN_INTERVAL = 60  # Seconds
+SCHEDULE_MAX_PER_USER = 10
+SCHEDULE_MAX_JITTER = 30  # Seconds, spreads jobs so they don't start together
+
+# Live dashboard (/watch)
+WATCH_DEFAULT_INTERVAL = 10  # Seconds between refreshes
+WATCH_MIN_INTERVAL = 5
+WATCH_TICK = 5  # How often due dashboards are checked
+WATCH_TTL = 900  # Dashboards stop refreshing after this many seconds
@@ -1,19 +1,29 @@
 # main.py
+import os
 import logging
 import asyncio
+import time
 from datetime import datetime, timedelta
-from typing import Dict
+from typing import Dict, List, Optional
 from telegram import Update, Bot
-from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes
+from telegram.ext import Application, ApplicationBuilder, CommandHandler, MessageHandler, filters, ContextTypes
 from telegram.constants import ParseMode
+from telegram.error import BadRequest, Forbidden, RetryAfter
 
 # Import our modules
 from modules.temperature_monitor import TemperatureMonitor
 from modules.system_monitor import SystemMonitor
 from modules.command_executor import CommandExecutor
+from modules.log_reader import LogReader
+from modules.command_scheduler import CommandScheduler, parse_interval, format_interval
+from modules.dashboard import DashboardManager
+from modules.metrics_store import MetricsStore, METRICS
+from modules.runtime_config import RuntimeConfig, config_manager, get_config
+from modules.systemd_notify import SystemdNotifier, HealthMonitor
 from config.config import (
-    BOT_TOKEN, AUTHORIZED_USERS, RATE_LIMIT, 
-    LOG_LEVEL, LOG_FILE, TEMP_CRITICAL_THRESHOLD
+    BOT_TOKEN, LOG_LEVEL, LOG_FILE, TEMP_PREDICT_HORIZON, LOG_DEFAULT_LINES,
+    WATCH_DEFAULT_INTERVAL, WATCH_MIN_INTERVAL, WATCH_TICK, CONFIG_WATCH_INTERVAL,
+    BATCH_CONCURRENCY, SAVED_BATCHES, METRICS_SAMPLE_INTERVAL, WATCHDOG_SAMPLER_MISSES
 )
 
 # Configure logging
@@ -27,20 +37,56 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+MESSAGE_LIMIT = 4096  # Telegram message length limit
+
+
+def split_message(text: str, limit: int = MESSAGE_LIMIT) -> List[str]:
+    """Split Markdown text at line breaks, closing and reopening code blocks across parts"""
+    if len(text) <= limit:
+        return [text]
+    
+    parts = []
+    current = ''
+    in_code = False
+    for line in text.split('\n'):
+        # Lines longer than a whole message are hard-wrapped
+        pieces = [line[i:i + limit - 16] for i in range(0, len(line), limit - 16)] or ['']
+        for piece in pieces:
+            # Leave room for a closing fence
+            if current and len(current) + len(piece) + 5 > limit:
+                parts.append(current + ('\n```' if in_code else ''))
+                current = '```\n' if in_code else ''
+            current += piece + '\n'
+        if line.strip().startswith('```'):
+            in_code = not in_code
+    
+    if current.strip() and current != '```\n':
+        parts.append(current.rstrip('\n'))
+    return parts
+
 class RaspberryPiBot:
     def __init__(self):
         self.temp_monitor = TemperatureMonitor()
         self.system_monitor = SystemMonitor()
         self.command_executor = CommandExecutor()
+        self.log_reader = LogReader()
+        self.scheduler = CommandScheduler()
+        self.dashboard = DashboardManager(self.temp_monitor, self.system_monitor)
+        self.metrics_store = MetricsStore(self.temp_monitor, self.system_monitor)
+        self.notifier = SystemdNotifier()
+        self.health = HealthMonitor(sampler_timeout=METRICS_SAMPLE_INTERVAL * WATCHDOG_SAMPLER_MISSES)
+        self.health_probe = None  # Event-loop lag probe task
         self.user_last_command = {}  # Rate limiting
         self.alert_sent = {}  # Temperature alert tracking
         
-    def is_user_authorized(self, user_id: int) -> bool:
+    def is_user_authorized(self, user_id: int, config: Optional[RuntimeConfig] = None) -> bool:
         """Check if user is authorized to use the bot"""
-        return user_id in AUTHORIZED_USERS
+        config = config or get_config()
+        return user_id in config.authorized_users
     
-    def check_rate_limit(self, user_id: int) -> bool:
+    def check_rate_limit(self, user_id: int, config: Optional[RuntimeConfig] = None) -> bool:
         """Check if user is within rate limit"""
+        config = config or get_config()
         now = datetime.now()
         if user_id not in self.user_last_command:
             self.user_last_command[user_id] = []
@@ -52,7 +98,7 @@ class RaspberryPiBot:
         ]
         
         # Check if under rate limit
-        if len(self.user_last_command[user_id]) >= RATE_LIMIT:
+        if len(self.user_last_command[user_id]) >= config.rate_limit:
             return False
         
         # Add current timestamp
@@ -62,8 +108,10 @@ class RaspberryPiBot:
     async def check_authorization(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> bool:
         """Check authorization and rate limiting"""
         user_id = update.effective_user.id
+        # One config for the whole check, even if a reload happens meanwhile
+        config = get_config()
         
-        if not self.is_user_authorized(user_id):
+        if not self.is_user_authorized(user_id, config):
             await update.message.reply_text(
                 "❌ **Access Denied**\n\nYou are not authorized to use this bot.",
                 parse_mode=ParseMode.MARKDOWN
@@ -71,9 +119,9 @@ class RaspberryPiBot:
             logger.warning(f"Unauthorized access attempt from user {user_id}")
             return False
         
-        if not self.check_rate_limit(user_id):
+        if not self.check_rate_limit(user_id, config):
             await update.message.reply_text(
-                f"⏱️ **Rate Limited**\n\nToo many commands. Limit: {RATE_LIMIT} per minute.",
+                f"⏱️ **Rate Limited**\n\nToo many commands. Limit: {config.rate_limit} per minute.",
                 parse_mode=ParseMode.MARKDOWN
             )
             return False
@@ -95,8 +143,11 @@ class RaspberryPiBot:
         welcome_msg += "• `/temp` - Temperature status\n"
         welcome_msg += "• `/system` - System status\n"
         welcome_msg += "• `/cmd <command>` - Execute command\n"
+        welcome_msg += "• `/logs <file|unit>` - View logs\n"
+        welcome_msg += "• `/schedule <interval> <command>` - Run command periodically\n"
         welcome_msg += "• `/help` - Show help\n"
         welcome_msg += "• `/status` - Quick status check\n"
+        welcome_msg += "• `/watch [interval]` - Live dashboard\n"
         
         await update.message.reply_text(welcome_msg, parse_mode=ParseMode.MARKDOWN)
     
@@ -140,50 +191,274 @@ class RaspberryPiBot:
             # Show typing indicator
             await context.bot.send_chat_action(chat_id=update.effective_chat.id, action="typing")
             
-            result = self.command_executor.execute_command(command)
+            # Off the event loop so a slow command doesn't stall other updates
+            result = await asyncio.to_thread(
+                self.command_executor.execute_command, command, update.effective_user.id
+            )
             response = self.command_executor.format_command_result(result)
             
             # Split long messages
-            if len(response) > 4096:
-                for i in range(0, len(response), 4096):
-                    await update.message.reply_text(
-                        response[i:i+4096], 
-                        parse_mode=ParseMode.MARKDOWN
-                    )
-            else:
-                await update.message.reply_text(response, parse_mode=ParseMode.MARKDOWN)
+            for part in split_message(response):
+                await update.message.reply_text(part, parse_mode=ParseMode.MARKDOWN)
                 
         except Exception as e:
             logger.error(f"Error executing command '{command}': {e}")
             await update.message.reply_text(f"❌ Error executing command: {str(e)}")
     
+    async def run_batch(self, update: Update, context: ContextTypes.DEFAULT_TYPE,
+                        commands: List[str], title: str):
+        """Run commands concurrently (bounded) and reply once with all results"""
+        await context.bot.send_chat_action(chat_id=update.effective_chat.id, action="typing")
+        
+        user_id = update.effective_user.id
+        semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+        
+        async def run_one(command: str) -> Dict:
+            async with semaphore:
+                return await asyncio.to_thread(self.command_executor.execute_command, command, user_id)
+        
+        started = time.perf_counter()
+        # gather keeps the original order regardless of completion order
+        results = await asyncio.gather(*(run_one(command) for command in commands))
+        response = self.command_executor.format_batch_result(results, time.perf_counter() - started, title)
+        for part in split_message(response):
+            await update.message.reply_text(part, parse_mode=ParseMode.MARKDOWN)
+    
+    async def batch_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handle /batch command - several commands, one reply"""
+        if not await self.check_authorization(update, context):
+            return
+        
+        if not context.args:
+            await update.message.reply_text(
+                "📦 **Usage:** `/batch <cmd1> ; <cmd2> ; ...`\n\n"
+                "Example: `/batch uptime ; free -h ; df -h`",
+                parse_mode=ParseMode.MARKDOWN
+            )
+            return
+        
+        commands, error = self.command_executor.parse_batch(' '.join(context.args))
+        if error:
+            await update.message.reply_text(f"❌ **Batch Rejected**\n\n{error}", parse_mode=ParseMode.MARKDOWN)
+            return
+        
+        try:
+            await self.run_batch(update, context, commands, "Batch")
+        except Exception as e:
+            logger.error(f"Error executing batch: {e}")
+            await update.message.reply_text(f"❌ Error executing batch: {str(e)}")
+    
+    async def run_saved_batch_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handle /run command - execute a saved batch"""
+        if not await self.check_authorization(update, context):
+            return
+        
+        if not context.args:
+            message = "📦 **Saved Batches**\n\n"
+            for name, commands in SAVED_BATCHES.items():
+                message += f"• `{name}`: {' ; '.join(commands)}\n"
+            message += "\nUsage: `/run <name>`"
+            await update.message.reply_text(message, parse_mode=ParseMode.MARKDOWN)
+            return
+        
+        name = context.args[0]
+        saved = self.command_executor.get_saved_batch(name)
+        if saved is None:
+            await update.message.reply_text(f"❌ Unknown batch: {name}")
+            return
+        
+        # Saved batches go through the same whitelist checks as typed ones
+        commands, error = self.command_executor.parse_batch(' ; '.join(saved))
+        if error:
+            await update.message.reply_text(f"❌ **Batch Rejected**\n\n{error}", parse_mode=ParseMode.MARKDOWN)
+            return
+        
+        try:
+            await self.run_batch(update, context, commands, name)
+        except Exception as e:
+            logger.error(f"Error executing batch '{name}': {e}")
+            await update.message.reply_text(f"❌ Error executing batch: {str(e)}")
+    
+    async def cmdstats_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handle /cmdstats command - heaviest commands by resource usage"""
+        if not await self.check_authorization(update, context):
+            return
+        
+        await update.message.reply_text(
+            self.command_executor.format_command_stats(),
+            parse_mode=ParseMode.MARKDOWN
+        )
+    
+    async def logs_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handle /logs command"""
+        if not await self.check_authorization(update, context):
+            return
+        
+        if not context.args:
+            help_text = self.log_reader.get_logs_help()
+            await update.message.reply_text(help_text, parse_mode=ParseMode.MARKDOWN)
+            return
+        
+        source = context.args[0]
+        rest = context.args[1:]
+        lines = LOG_DEFAULT_LINES
+        if rest and rest[-1].isdigit():
+            lines = int(rest.pop())
+        pattern = ' '.join(rest) or None
+        
+        try:
+            # Reading is blocking file I/O, keep it off the event loop
+            result = await asyncio.to_thread(self.log_reader.tail, source, pattern, lines)
+            response = self.log_reader.format_log_result(result)
+            # Header, pattern and fences come on top of the trimmed body
+            for part in split_message(response):
+                await update.message.reply_text(part, parse_mode=ParseMode.MARKDOWN)
+        except Exception as e:
+            logger.error(f"Error reading log '{source}': {e}")
+            await update.message.reply_text(f"❌ Error reading log: {str(e)}")
+    
+    def add_schedule_job(self, job_queue, schedule: Dict):
+        """Register a schedule on the job queue"""
+        job_queue.run_repeating(
+            self.run_scheduled_command,
+            interval=schedule['interval'],
+            first=self.scheduler.get_first_delay(schedule['interval']),
+            name=f"schedule_{schedule['id']}",
+            data=schedule['id'],
+            job_kwargs={'jitter': self.scheduler.get_jitter(schedule['interval'])}
+        )
+    
+    async def run_scheduled_command(self, context: ContextTypes.DEFAULT_TYPE):
+        """Run a scheduled command and report only when its output changed"""
+        schedule = self.scheduler.get_schedule(context.job.data)
+        if not schedule:
+            context.job.schedule_removal()
+            return
+        
+        # Keep the job: access may come back with a /reload
+        if not self.is_user_authorized(schedule['user_id']):
+            return
+        
+        try:
+            result = await asyncio.to_thread(
+                self.command_executor.execute_command, schedule['command'], schedule['user_id']
+            )
+            result_hash = self.scheduler.hash_result(result)
+            if not self.scheduler.is_new_result(schedule['id'], result_hash):
+                return
+            
+            response = f"📅 **Schedule #{schedule['id']}** (every {format_interval(schedule['interval'])})\n"
+            response += self.command_executor.format_command_result(result)
+            for part in split_message(response):
+                await context.bot.send_message(
+                    chat_id=schedule['chat_id'],
+                    text=part,
+                    parse_mode=ParseMode.MARKDOWN
+                )
+            
+            # Only after sending, so a failed send is retried on the next run
+            self.scheduler.record_result(schedule['id'], result_hash)
+        except Exception as e:
+            logger.error(f"Error in scheduled command #{schedule['id']}: {e}")
+    
+    async def schedule_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handle /schedule command"""
+        if not await self.check_authorization(update, context):
+            return
+        
+        if len(context.args) < 2:
+            await update.message.reply_text(
+                "📅 **Usage:** `/schedule <interval> <command>`\n\n"
+                "Interval examples: `90`, `30s`, `5m`, `1h`, `1d`\n"
+                "Example: `/schedule 1h df -h`",
+                parse_mode=ParseMode.MARKDOWN
+            )
+            return
+        
+        interval = parse_interval(context.args[0])
+        if interval is None:
+            await update.message.reply_text(f"❌ Invalid interval: {context.args[0]}")
+            return
+        
+        command = ' '.join(context.args[1:])
+        allowed, reason = self.command_executor.is_command_allowed(command)
+        if not allowed:
+            await update.message.reply_text(f"❌ Security check failed: {reason}")
+            return
+        
+        result = self.scheduler.add_schedule(
+            update.effective_user.id, update.effective_chat.id, interval, command
+        )
+        if not result['success']:
+            await update.message.reply_text(f"❌ {result['error']}")
+            return
+        
+        schedule = result['schedule']
+        self.add_schedule_job(context.job_queue, schedule)
+        await update.message.reply_text(
+            f"✅ **Scheduled #{schedule['id']}**\n\n"
+            f"`{command}` every {format_interval(interval)}.\n"
+            "You will be notified when the output changes.",
+            parse_mode=ParseMode.MARKDOWN
+        )
+    
+    async def schedules_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handle /schedules command"""
+        if not await self.check_authorization(update, context):
+            return
+        
+        schedules = self.scheduler.get_user_schedules(update.effective_user.id)
+        await update.message.reply_text(
+            self.scheduler.format_schedules(schedules),
+            parse_mode=ParseMode.MARKDOWN
+        )
+    
+    async def unschedule_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handle /unschedule command"""
+        if not await self.check_authorization(update, context):
+            return
+        
+        if not context.args or not context.args[0].lstrip('#').isdigit():
+            await update.message.reply_text("Usage: `/unschedule <id>`", parse_mode=ParseMode.MARKDOWN)
+            return
+        
+        schedule_id = int(context.args[0].lstrip('#'))
+        if not self.scheduler.remove_schedule(schedule_id, update.effective_user.id):
+            await update.message.reply_text(f"❌ Schedule #{schedule_id} not found")
+            return
+        
+        for job in context.job_queue.get_jobs_by_name(f"schedule_{schedule_id}"):
+            job.schedule_removal()
+        
+        await update.message.reply_text(f"🗑️ Schedule #{schedule_id} removed")
+    
     async def status_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /status command - quick overview"""
         if not await self.check_authorization(update, context):
             return
         
         try:
-            temp_status = self.temp_monitor.get_temperature_status()
-            cpu_data = self.system_monitor.get_cpu_usage()
-            mem_data = self.system_monitor.get_memory_usage()
+            thermal = self.temp_monitor.get_temperature_status()
+            cpu = self.system_monitor.get_cpu_usage()
+            mem = self.system_monitor.get_memory_usage()
             uptime_data = self.system_monitor.get_system_uptime()
             
             status_msg = "⚡ **Quick Status**\n\n"
             
             # Temperature
-            if temp_status['cpu_temp']:
-                temp_emoji = "🔥" if temp_status['critical'] else "⚠️" if temp_status['warning'] else "✅"
-                status_msg += f"{temp_emoji} **Temp:** {temp_status['cpu_temp']:.1f}°C\n"
+            if thermal.ok:
+                temp_emoji = "🔥" if thermal.critical else "⚠️" if thermal.warning else "✅"
+                status_msg += f"{temp_emoji} **Temp:** {thermal.cpu_temp:.1f}°C\n"
             
             # CPU
-            if 'error' not in cpu_data:
-                cpu_emoji = "⚠️" if cpu_data.get('warning') else "✅"
-                status_msg += f"{cpu_emoji} **CPU:** {cpu_data['overall']:.1f}%\n"
+            if cpu.ok:
+                cpu_emoji = "⚠️" if cpu.warning else "✅"
+                status_msg += f"{cpu_emoji} **CPU:** {cpu.overall:.1f}%\n"
             
             # Memory
-            if 'error' not in mem_data:
-                mem_emoji = "⚠️" if mem_data.get('warning') else "✅"
-                status_msg += f"{mem_emoji} **Memory:** {mem_data['percent']:.1f}%\n"
+            if mem.ok:
+                mem_emoji = "⚠️" if mem.warning else "✅"
+                status_msg += f"{mem_emoji} **Memory:** {mem.percent:.1f}%\n"
             
             # Uptime
             if 'error' not in uptime_data:
@@ -195,6 +470,229 @@ class RaspberryPiBot:
             logger.error(f"Error in status command: {e}")
             await update.message.reply_text(f"❌ Error getting status: {str(e)}")
     
+    async def watch_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handle /watch command - live dashboard edited in place"""
+        if not await self.check_authorization(update, context):
+            return
+        
+        interval = WATCH_DEFAULT_INTERVAL
+        if context.args:
+            interval = parse_interval(context.args[0])
+            if interval is None:
+                await update.message.reply_text(f"❌ Invalid interval: {context.args[0]}")
+                return
+            interval = max(interval, WATCH_MIN_INTERVAL)
+        
+        try:
+            body = await asyncio.to_thread(self.dashboard.render_snapshot)
+            chat_id = update.effective_chat.id
+            
+            previous = self.dashboard.remove_watcher(chat_id)
+            if previous:
+                await self.stop_dashboard_message(context, previous)
+            
+            watcher = self.dashboard.add_watcher(chat_id, None, interval, body)
+            message = await update.message.reply_text(watcher['last_text'], parse_mode=ParseMode.MARKDOWN)
+            watcher['message_id'] = message.message_id
+            
+            if not context.job_queue.get_jobs_by_name('dashboard'):
+                context.job_queue.run_repeating(
+                    self.refresh_dashboards, interval=WATCH_TICK, first=WATCH_TICK, name='dashboard'
+                )
+        except Exception as e:
+            logger.error(f"Error in watch command: {e}")
+            self.dashboard.remove_watcher(update.effective_chat.id)
+            await update.message.reply_text(f"❌ Error starting dashboard: {str(e)}")
+    
+    async def unwatch_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handle /unwatch command"""
+        if not await self.check_authorization(update, context):
+            return
+        
+        watcher = self.dashboard.remove_watcher(update.effective_chat.id)
+        if not watcher:
+            await update.message.reply_text("No live dashboard running.")
+            return
+        
+        await self.stop_dashboard_message(context, watcher)
+        await update.message.reply_text("⏹️ Live dashboard stopped")
+    
+    async def stop_dashboard_message(self, context: ContextTypes.DEFAULT_TYPE, watcher: Dict):
+        """Mark a dashboard message as no longer refreshing"""
+        body = watcher['last_text'].rsplit('\n🔄', 1)[0]
+        try:
+            await context.bot.edit_message_text(
+                chat_id=watcher['chat_id'],
+                message_id=watcher['message_id'],
+                text=body + "\n⏹️ Stopped",
+                parse_mode=ParseMode.MARKDOWN
+            )
+        except Exception as e:
+            logger.debug(f"Could not mark dashboard in {watcher['chat_id']} as stopped: {e}")
+    
+    async def refresh_dashboards(self, context: ContextTypes.DEFAULT_TYPE):
+        """Refresh due dashboards from one shared snapshot"""
+        now = time.monotonic()
+        
+        for watcher in self.dashboard.pop_expired(now):
+            await self.stop_dashboard_message(context, watcher)
+        
+        if not self.dashboard.watchers:
+            context.job.schedule_removal()
+            return
+        
+        due = self.dashboard.get_due_watchers(now)
+        if not due:
+            return
+        
+        try:
+            body = await asyncio.to_thread(self.dashboard.render_snapshot)
+        except Exception as e:
+            logger.error(f"Error rendering dashboard: {e}")
+            return
+        
+        for watcher in due:
+            text = self.dashboard.render_watcher(body, watcher)
+            if text == watcher['last_text']:
+                continue
+            try:
+                await context.bot.edit_message_text(
+                    chat_id=watcher['chat_id'],
+                    message_id=watcher['message_id'],
+                    text=text,
+                    parse_mode=ParseMode.MARKDOWN
+                )
+                watcher['last_text'] = text
+            except RetryAfter as e:
+                # Flood control - try this dashboard again once the wait is over
+                delay = e.retry_after
+                delay = delay.total_seconds() if isinstance(delay, timedelta) else delay
+                watcher['next_update'] = max(watcher['next_update'], now + delay)
+                logger.warning(f"Dashboard in {watcher['chat_id']} rate limited for {delay}s")
+            except (Forbidden, BadRequest) as e:
+                # Message deleted or chat unavailable - stop watching it
+                if isinstance(e, BadRequest) and 'not found' not in e.message.lower():
+                    logger.warning(f"Error updating dashboard in {watcher['chat_id']}: {e}")
+                    continue
+                logger.warning(f"Stopping dashboard in {watcher['chat_id']}: {e}")
+                self.dashboard.remove_watcher(watcher['chat_id'])
+            except Exception as e:
+                # Timeouts and network errors - keep the watcher for the next tick
+                logger.warning(f"Error updating dashboard in {watcher['chat_id']}: {e}")
+    
+    async def reload_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handle /reload command - re-read config/config.py"""
+        if not await self.check_authorization(update, context):
+            return
+        
+        success, details = await asyncio.to_thread(config_manager.reload)
+        if success:
+            await update.message.reply_text(
+                f"🔄 **Config Reloaded**\n\nChanged: {details}",
+                parse_mode=ParseMode.MARKDOWN
+            )
+        else:
+            await update.message.reply_text(
+                f"❌ **Config Reload Failed**\n\nKeeping previous settings.\n**Error:** {details}",
+                parse_mode=ParseMode.MARKDOWN
+            )
+    
+    async def watch_config_file(self, context: ContextTypes.DEFAULT_TYPE):
+        """Reload the config when config/config.py changes"""
+        if config_manager.has_changed():
+            await asyncio.to_thread(config_manager.reload)
+    
+    async def record_metrics(self, context: ContextTypes.DEFAULT_TYPE):
+        """Append one metrics sample for later export"""
+        try:
+            await asyncio.to_thread(self.metrics_store.collect_sample)
+        except Exception as e:
+            logger.error(f"Error recording metrics: {e}")
+        # The watchdog looks for a hung sampler; a failing one is only logged,
+        # since a restart wouldn't fix it
+        self.health.sampler_heartbeat()
+    
+    async def notify_ready(self, context: ContextTypes.DEFAULT_TYPE):
+        """Tell systemd startup finished and start the event-loop lag probe"""
+        self.health_probe = asyncio.create_task(self.health.probe_loop())
+        self.notifier.ready(status="Polling for updates")
+        logger.info("Notified systemd that the bot is ready")
+    
+    async def watchdog_ping(self, context: ContextTypes.DEFAULT_TYPE):
+        """Ping the systemd watchdog only while the loop and sampler are healthy"""
+        healthy, reason = self.health.check()
+        status = (
+            f"loop lag {self.health.loop_lag * 1000:.0f} ms, "
+            f"{context.application.update_queue.qsize()} updates queued, "
+            f"last sample {self.health.get_sampler_age():.0f}s ago"
+        )
+        
+        if healthy:
+            self.notifier.watchdog(status=status)
+        else:
+            # Let WatchdogSec expire so systemd restarts the bot
+            logger.warning(f"Skipping watchdog ping: {reason}")
+            self.notifier.status(f"Unhealthy: {reason}; {status}")
+    
+    async def post_stop(self, application: Application):
+        """Tell systemd we are shutting down on purpose"""
+        if self.health_probe:
+            self.health_probe.cancel()
+        self.notifier.stopping()
+    
+    async def export_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Handle /export command - send metrics history as a compressed file"""
+        if not await self.check_authorization(update, context):
+            return
+        
+        if len(context.args) < 2:
+            await update.message.reply_text(self.metrics_store.get_metrics_help(), parse_mode=ParseMode.MARKDOWN)
+            return
+        
+        metrics = list(METRICS) if context.args[0] == 'all' else context.args[0].split(',')
+        unknown = [name for name in metrics if name not in METRICS]
+        if unknown:
+            await update.message.reply_text(f"❌ Unknown metrics: {', '.join(unknown)}")
+            return
+        
+        window = parse_interval(context.args[1])
+        if not window:
+            await update.message.reply_text(f"❌ Invalid window: {context.args[1]}")
+            return
+        
+        resolution = None
+        fmt = 'csv'
+        for arg in context.args[2:4]:
+            if arg in ('csv', 'bin'):
+                fmt = arg
+            elif parse_interval(arg):
+                resolution = parse_interval(arg)
+            else:
+                await update.message.reply_text(f"❌ Invalid option: {arg}")
+                return
+        
+        resolution = self.metrics_store.get_resolution(window, resolution, METRICS_SAMPLE_INTERVAL)
+        
+        try:
+            await context.bot.send_chat_action(chat_id=update.effective_chat.id, action="upload_document")
+            path, rows = await asyncio.to_thread(self.metrics_store.export, metrics, window, resolution, fmt)
+            try:
+                if not rows:
+                    await update.message.reply_text("No metrics recorded in that window.")
+                    return
+                
+                with open(path, 'rb') as f:
+                    await update.message.reply_document(
+                        document=f,
+                        filename=f"metrics-{context.args[1]}.{'csv' if fmt == 'csv' else 'pimx'}.gz",
+                        caption=f"📤 {rows} rows at {format_interval(int(resolution))} resolution: {', '.join(metrics)}"
+                    )
+            finally:
+                os.remove(path)
+        except Exception as e:
+            logger.error(f"Error exporting metrics: {e}")
+            await update.message.reply_text(f"❌ Error exporting metrics: {str(e)}")
+    
     async def help_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /help command"""
         if not await self.check_authorization(update, context):
@@ -206,14 +704,25 @@ class RaspberryPiBot:
         help_text += "• `/temp` - Get temperature report\n"
         help_text += "• `/system` - Get system resource report\n"
         help_text += "• `/status` - Quick status overview\n"
+        help_text += "• `/watch [interval]` - Live dashboard updated in place\n"
+        help_text += "• `/unwatch` - Stop the live dashboard\n"
         help_text += "• `/cmd <command>` - Execute shell command\n"
+        help_text += "• `/batch <cmd1> ; <cmd2>` - Run several commands, one reply\n"
+        help_text += "• `/run <name>` - Run a saved batch (e.g. `healthcheck`)\n"
+        help_text += "• `/cmdstats` - Heaviest commands by CPU and memory\n"
+        help_text += "• `/logs <file|unit> [pattern] [n]` - Search recent log lines\n"
+        help_text += "• `/schedule <interval> <command>` - Run command periodically, notify on change\n"
+        help_text += "• `/schedules` - List your scheduled commands\n"
+        help_text += "• `/unschedule <id>` - Remove a scheduled command\n"
+        help_text += "• `/export <metrics> <window>` - Download metrics history (gzip CSV or binary)\n"
+        help_text += "• `/reload` - Reload users, commands, thresholds and rate limit from config\n"
         help_text += "• `/help` - Show this help\n\n"
         
         help_text += "**Security Features:**\n"
         help_text += f"• Command whitelist ({len(self.command_executor.get_allowed_commands())} allowed)\n"
         help_text += "• User authorization required\n"
-        help_text += f"• Rate limiting ({RATE_LIMIT} commands/minute)\n"
-        help_text += "• Command timeout (30 seconds)\n"
+        help_text += f"• Rate limiting ({get_config().rate_limit} commands/minute)\n"
+        help_text += "• Command timeout (30 seconds) and optional CPU/memory limits\n"
         help_text += "• Input validation and sanitization\n\n"
         
         help_text += "**Examples:**\n"
@@ -244,34 +753,64 @@ class RaspberryPiBot:
                 parse_mode=ParseMode.MARKDOWN
             )
     
+    async def send_alert(self, context: ContextTypes.DEFAULT_TYPE, alert_msg: str):
+        """Send an alert to all authorized users"""
+        for user_id in get_config().authorized_users:
+            try:
+                await context.bot.send_message(
+                    chat_id=user_id,
+                    text=alert_msg,
+                    parse_mode=ParseMode.MARKDOWN
+                )
+            except Exception as e:
+                logger.error(f"Failed to send alert to {user_id}: {e}")
+    
     async def periodic_monitoring(self, context: ContextTypes.DEFAULT_TYPE):
-        """Periodic monitoring and alerts"""
+        """Periodic monitoring and alerts, rescheduled by temperature trend"""
         try:
-            temp_status = self.temp_monitor.get_temperature_status()
+            thermal = await asyncio.to_thread(self.temp_monitor.get_temperature_status)
             
             # Temperature alerts
-            if temp_status['critical'] and not self.alert_sent.get('temp_critical'):
+            if thermal.critical and not self.alert_sent.get('temp_critical'):
                 alert_msg = f"🚨 **CRITICAL TEMPERATURE ALERT**\n\n"
-                alert_msg += f"CPU Temperature: {temp_status['cpu_temp']:.1f}°C\n"
-                alert_msg += f"Threshold: {TEMP_CRITICAL_THRESHOLD}°C\n\n"
+                alert_msg += f"CPU Temperature: {thermal.cpu_temp:.1f}°C\n"
+                alert_msg += f"Threshold: {get_config().temp_critical}°C\n\n"
                 alert_msg += "Please check cooling and reduce load!"
                 
-                for user_id in AUTHORIZED_USERS:
-                    try:
-                        await context.bot.send_message(
-                            chat_id=user_id,
-                            text=alert_msg,
-                            parse_mode=ParseMode.MARKDOWN
-                        )
-                    except Exception as e:
-                        logger.error(f"Failed to send alert to {user_id}: {e}")
-                
+                await self.send_alert(context, alert_msg)
                 self.alert_sent['temp_critical'] = True
-            elif not temp_status['critical']:
+            elif not thermal.critical:
                 self.alert_sent['temp_critical'] = False
+            
+            # Predictive alert before the critical threshold is reached
+            time_to_critical = thermal.time_to_critical
+            predicted = (
+                not thermal.critical
+                and time_to_critical is not None
+                and time_to_critical <= TEMP_PREDICT_HORIZON
+            )
+            if predicted and not self.alert_sent.get('temp_predicted'):
+                alert_msg = f"📈 **TEMPERATURE RISING**\n\n"
+                alert_msg += f"CPU Temperature: {thermal.cpu_temp:.1f}°C\n"
+                alert_msg += f"Trend: {thermal.trend:+.2f}°C/min\n"
+                alert_msg += f"Critical ({get_config().temp_critical}°C) expected in ~{time_to_critical / 60:.0f} min\n\n"
+                alert_msg += "Consider reducing load before the Pi throttles."
+                
+                await self.send_alert(context, alert_msg)
+                self.alert_sent['temp_predicted'] = True
+            elif thermal.critical or time_to_critical is None or time_to_critical > TEMP_PREDICT_HORIZON * 2:
+                # Hysteresis: re-arm only once the prediction is well clear of the horizon
+                self.alert_sent['temp_predicted'] = False
                 
         except Exception as e:
             logger.error(f"Error in periodic monitoring: {e}")
+        finally:
+            # Adaptive sampling: check sooner while hot or rising
+            context.job_queue.run_once(
+                self.periodic_monitoring,
+                when=self.temp_monitor.trend.get_next_interval(),
+                name='periodic_monitoring'
+            )
     
     def run(self):
         """Run the bot"""
@@ -279,35 +818,76 @@ class RaspberryPiBot:
             logger.error("Bot token not configured. Please set BOT_TOKEN in config/config.py")
             return
         
-        if not AUTHORIZED_USERS:
+        if not get_config().authorized_users:
             logger.error("No authorized users configured. Please add user IDs to AUTHORIZED_USERS in config/config.py")
             return
         
         logger.info("Starting Raspberry Pi Telegram Bot...")
         
-        # Create application
-        application = Application.builder().token(BOT_TOKEN).build()
+        application = self.build_application(Application.builder().token(BOT_TOKEN))
+        
+        logger.info("Bot started successfully!")
+        
+        # Run the bot
+        application.run_polling(allowed_updates=Update.ALL_TYPES)
+    
+    def build_application(self, builder: ApplicationBuilder) -> Application:
+        """Create the application with all handlers and jobs registered"""
+        application = builder.post_stop(self.post_stop).build()
         
         # Add handlers
         application.add_handler(CommandHandler("start", self.start_command))
         application.add_handler(CommandHandler("temp", self.temperature_command))
         application.add_handler(CommandHandler("system", self.system_command))
         application.add_handler(CommandHandler("cmd", self.command_handler))
+        application.add_handler(CommandHandler("batch", self.batch_command))
+        application.add_handler(CommandHandler("run", self.run_saved_batch_command))
+        application.add_handler(CommandHandler("cmdstats", self.cmdstats_command))
+        application.add_handler(CommandHandler("logs", self.logs_command))
+        application.add_handler(CommandHandler("schedule", self.schedule_command))
+        application.add_handler(CommandHandler("schedules", self.schedules_command))
+        application.add_handler(CommandHandler("unschedule", self.unschedule_command))
         application.add_handler(CommandHandler("status", self.status_command))
+        application.add_handler(CommandHandler("watch", self.watch_command))
+        application.add_handler(CommandHandler("unwatch", self.unwatch_command))
+        application.add_handler(CommandHandler("export", self.export_command))
+        application.add_handler(CommandHandler("reload", self.reload_command))
         application.add_handler(CommandHandler("help", self.help_command))
         application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, self.unknown_command))
         
         # Add error handler
         application.add_error_handler(self.error_handler)
         
-        # Add periodic monitoring job (every 5 minutes)
+        # Add periodic monitoring job (reschedules itself based on temperature trend)
         job_queue = application.job_queue
-        job_queue.run_repeating(self.periodic_monitoring, interval=300, first=60)
+        job_queue.run_once(self.periodic_monitoring, when=60, name='periodic_monitoring')
         
-        logger.info("Bot started successfully!")
+        # Record metrics history for /export
+        if METRICS_SAMPLE_INTERVAL:
+            job_queue.run_repeating(
+                self.record_metrics, interval=METRICS_SAMPLE_INTERVAL, first=METRICS_SAMPLE_INTERVAL
+            )
         
-        # Run the bot
-        application.run_polling(allowed_updates=Update.ALL_TYPES)
+        # Pick up config/config.py edits without a restart
+        if CONFIG_WATCH_INTERVAL:
+            job_queue.run_repeating(
+                self.watch_config_file, interval=CONFIG_WATCH_INTERVAL, first=CONFIG_WATCH_INTERVAL
+            )
+        
+        # systemd Type=notify: READY=1 once the job queue is running, then watchdog pings
+        if self.notifier.enabled:
+            job_queue.run_once(self.notify_ready, when=0)
+            watchdog_interval = self.notifier.get_watchdog_interval()
+            if watchdog_interval:
+                job_queue.run_repeating(
+                    self.watchdog_ping, interval=watchdog_interval, first=watchdog_interval
+                )
+        
+        # Restore persisted command schedules
+        for schedule in self.scheduler.get_schedules():
+            self.add_schedule_job(job_queue, schedule)
+        
+        return application
 
 def main():
     """Main function"""
@@ -1,17 +1,44 @@
 # modules/command_executor.py
+import os
+import signal
 import subprocess
 import shlex
 import logging
 import re
-from typing import Dict, List, Tuple
-from config.config import ALLOWED_COMMANDS
+import threading
+import time
+import psutil
+from typing import Dict, List, Optional, Tuple
+from config.config import (
+    COMMAND_CPU_LIMIT, COMMAND_MEMORY_LIMIT, COMMAND_RESOURCE_LIMITS,
+    BATCH_MAX_COMMANDS, SAVED_BATCHES
+)
+from modules.runtime_config import get_config
 
 logger = logging.getLogger(__name__)
 
+# Compiled once at import; checked against every command
+DANGEROUS_PATTERNS = tuple(re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'rm\s+-rf\s+/',  # Dangerous rm commands
+    r'>\s*/dev/',     # Writing to device files
+    r'mkfs',          # Format filesystem
+    r'fdisk',         # Disk partitioning
+    r'dd\s+.*of=',    # Dangerous dd operations
+    r'chmod\s+777',   # Overly permissive permissions
+    r'passwd',        # Password changes
+    r'su\s+',         # Switch user
+    r'sudo\s+',       # Sudo commands (if you want to block them)
+    r'\|.*rm',        # Piped rm commands
+    r'&.*rm',         # Background rm commands
+))
+
 class CommandExecutor:
     def __init__(self):
         self.max_output_length = 4000  # Telegram message limit consideration
         self.timeout = 30  # Command timeout in seconds
+        self.stats_by_user = {}  # user_id -> resource totals
+        self.stats_by_command = {}  # base command -> resource totals
+        self.stats_lock = threading.Lock()  # Commands may run in worker threads
         
     def is_command_allowed(self, command: str) -> Tuple[bool, str]:
         """Check if command is in whitelist and safe to execute"""
@@ -30,27 +57,13 @@ class CommandExecutor:
         base_command = args[0]
         
         # Check if base command is in whitelist
-        if base_command not in ALLOWED_COMMANDS:
+        if base_command not in get_config().allowed_commands:
             return False, f"Command '{base_command}' not allowed"
         
         # Additional security checks
-        dangerous_patterns = [
-            r'rm\s+-rf\s+/',  # Dangerous rm commands
-            r'>\s*/dev/',     # Writing to device files
-            r'mkfs',          # Format filesystem
-            r'fdisk',         # Disk partitioning
-            r'dd\s+.*of=',    # Dangerous dd operations
-            r'chmod\s+777',   # Overly permissive permissions
-            r'passwd',        # Password changes
-            r'su\s+',         # Switch user
-            r'sudo\s+',       # Sudo commands (if you want to block them)
-            r'\|.*rm',        # Piped rm commands
-            r'&.*rm',         # Background rm commands
-        ]
-        
-        for pattern in dangerous_patterns:
-            if re.search(pattern, command, re.IGNORECASE):
-                return False, f"Command contains dangerous pattern: {pattern}"
+        for pattern in DANGEROUS_PATTERNS:
+            if pattern.search(command):
+                return False, f"Command contains dangerous pattern: {pattern.pattern}"
         
         # Check for command injection attempts
         injection_chars = [';', '&&', '||', '`', '$()']
@@ -60,7 +73,151 @@ class CommandExecutor:
         
         return True, "Command allowed"
     
-    def execute_command(self, command: str) -> Dict:
+    def get_resource_limits(self, base_command: str) -> Tuple[Optional[float], Optional[float]]:
+        """Get (CPU seconds, memory MB) ceilings for a base command"""
+        limits = COMMAND_RESOURCE_LIMITS.get(base_command, {})
+        return limits.get('cpu', COMMAND_CPU_LIMIT), limits.get('memory', COMMAND_MEMORY_LIMIT)
+    
+    def _read_stream(self, stream, output: Dict, key: str):
+        """Drain a child pipe so the child never blocks on a full buffer"""
+        output[key] = stream.read()
+        stream.close()
+    
+    def _read_peak_rss(self, pid: int) -> Optional[int]:
+        """Read a running child's peak resident memory (VmHWM) in bytes"""
+        try:
+            with open(f'/proc/{pid}/status', 'rb') as f:
+                for line in f:
+                    if line.startswith(b'VmHWM:'):
+                        return int(line.split()[1]) * 1024
+        except (OSError, ValueError, IndexError):
+            pass
+        return None
+    
+    def _run_with_accounting(self, args: List[str], cpu_limit: Optional[float],
+                             memory_limit: Optional[float]) -> Dict:
+        """Run a child process, enforcing limits and collecting its rusage"""
+        started = time.perf_counter()
+        proc = subprocess.Popen(
+            args,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            cwd='/home/pi',  # Set safe working directory
+            env={'PATH': '/usr/local/bin:/usr/bin:/bin'},  # Restricted PATH
+            shell=False,  # Never use shell=True for security
+            start_new_session=True  # Own process group, so limits kill its children too
+        )
+        
+        output = {'stdout': '', 'stderr': ''}
+        readers = [
+            threading.Thread(target=self._read_stream, args=(proc.stdout, output, 'stdout'), daemon=True),
+            threading.Thread(target=self._read_stream, args=(proc.stderr, output, 'stderr'), daemon=True)
+        ]
+        for reader in readers:
+            reader.start()
+        
+        try:
+            child = psutil.Process(proc.pid)
+        except psutil.NoSuchProcess:
+            child = None
+        
+        limit_error = None
+        peak_rss = None
+        poll_interval = 0.005
+        while True:
+            # wait4 reaps the child and returns its resource usage
+            pid, status, rusage = os.wait4(proc.pid, os.WNOHANG)
+            if pid:
+                break
+            
+            # Limits apply to the whole command, including anything it forks
+            tree_rss, tree_cpu = self._sample_tree(child) if child else (0, 0.0)
+            peak_rss = max(peak_rss or 0, tree_rss, self._read_peak_rss(proc.pid) or 0) or None
+            
+            if time.perf_counter() - started > self.timeout:
+                limit_error = f"Command timed out after {self.timeout} seconds"
+            elif memory_limit is not None and peak_rss and peak_rss > memory_limit * 1024**2:
+                limit_error = f"Command exceeded memory limit of {memory_limit} MB"
+            elif cpu_limit is not None and tree_cpu > cpu_limit:
+                limit_error = f"Command exceeded CPU limit of {cpu_limit} seconds"
+            
+            if limit_error:
+                self._kill_group(proc.pid)
+                pid, status, rusage = os.wait4(proc.pid, 0)
+                break
+            
+            time.sleep(poll_interval)
+            poll_interval = min(poll_interval * 2, 0.1)
+        
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        
+        # Background children can keep the pipes open after the child exits
+        for reader in readers:
+            reader.join(max(0.0, started + self.timeout - time.perf_counter()))
+        if any(reader.is_alive() for reader in readers):
+            limit_error = limit_error or f"Command timed out after {self.timeout} seconds"
+            self._kill_group(proc.pid)
+            for reader in readers:
+                reader.join(1)
+        
+        return {
+            'return_code': proc.returncode,
+            'stdout': output['stdout'],
+            'stderr': output['stderr'],
+            'limit_error': limit_error,
+            'usage': {
+                'wall_time': time.perf_counter() - started,
+                'user_time': rusage.ru_utime,
+                'system_time': rusage.ru_stime,
+                # rusage maxrss also counts the bot's own image from before exec,
+                # so only the sampled high-water mark of the whole process tree is
+                # reported (None if the command exited before the first sample)
+                'max_rss': peak_rss
+            }
+        }
+    
+    def _sample_tree(self, root: psutil.Process) -> Tuple[int, float]:
+        """Summed RSS (bytes) and CPU seconds of a command and all its descendants"""
+        try:
+            processes = [root] + root.children(recursive=True)
+        except psutil.Error:
+            return 0, 0.0
+        
+        rss, cpu = 0, 0.0
+        for process in processes:
+            try:
+                with process.oneshot():
+                    rss += process.memory_info().rss
+                    times = process.cpu_times()
+            except psutil.Error:
+                continue  # Exited between listing and sampling
+            # children_* covers descendants that already exited and were reaped
+            cpu += times.user + times.system + times.children_user + times.children_system
+        return rss, cpu
+    
+    def _kill_group(self, pgid: int):
+        """Kill a command and everything it started"""
+        try:
+            os.killpg(pgid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+    
+    def record_usage(self, user_id: Optional[int], base_command: str, usage: Dict):
+        """Add an execution to the per-user and per-command totals"""
+        with self.stats_lock:
+            for table, key in ((self.stats_by_command, base_command), (self.stats_by_user, user_id)):
+                if key is None:
+                    continue
+                entry = table.setdefault(key, {
+                    'count': 0, 'wall_time': 0.0, 'cpu_time': 0.0, 'max_rss': 0
+                })
+                entry['count'] += 1
+                entry['wall_time'] += usage['wall_time']
+                entry['cpu_time'] += usage['user_time'] + usage['system_time']
+                entry['max_rss'] = max(entry['max_rss'], usage['max_rss'] or 0)
+    
+    def execute_command(self, command: str, user_id: Optional[int] = None) -> Dict:
         """Execute a command safely with security checks"""
         # Security check
         allowed, reason = self.is_command_allowed(command)
@@ -75,20 +232,16 @@ class CommandExecutor:
         try:
             logger.info(f"Executing command: {command}")
             
-            # Execute command with timeout and security restrictions
-            result = subprocess.run(
-                shlex.split(command),
-                capture_output=True,
-                text=True,
-                timeout=self.timeout,
-                cwd='/home/pi',  # Set safe working directory
-                env={'PATH': '/usr/local/bin:/usr/bin:/bin'},  # Restricted PATH
-                shell=False  # Never use shell=True for security
-            )
+            args = shlex.split(command)
+            cpu_limit, memory_limit = self.get_resource_limits(args[0])
+            
+            # Execute command with timeout, resource limits and security restrictions
+            result = self._run_with_accounting(args, cpu_limit, memory_limit)
+            self.record_usage(user_id, args[0], result['usage'])
             
             # Prepare output
-            stdout = result.stdout
-            stderr = result.stderr
+            stdout = result['stdout']
+            stderr = result['stderr']
             
             # Truncate output if too long
             if len(stdout) > self.max_output_length:
@@ -97,29 +250,25 @@ class CommandExecutor:
             if len(stderr) > self.max_output_length:
                 stderr = stderr[:self.max_output_length] + "\n... (error output truncated)"
             
+            if result['limit_error']:
+                logger.warning(f"Command killed: {command} - {result['limit_error']}")
+                return {
+                    'success': False,
+                    'error': result['limit_error'],
+                    'stderr': stderr,
+                    'usage': result['usage'],
+                    'command': command
+                }
+            
             return {
-                'success': result.returncode == 0,
-                'return_code': result.returncode,
+                'success': result['return_code'] == 0,
+                'return_code': result['return_code'],
                 'stdout': stdout,
                 'stderr': stderr,
+                'usage': result['usage'],
                 'command': command
             }
             
-        except subprocess.TimeoutExpired:
-            logger.warning(f"Command timed out: {command}")
-            return {
-                'success': False,
-                'error': f"Command timed out after {self.timeout} seconds",
-                'command': command
-            }
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Command failed: {command} - Error: {e}")
-            return {
-                'success': False,
-                'error': f"Command failed with return code {e.returncode}",
-                'stderr': e.stderr if hasattr(e, 'stderr') else '',
-                'command': command
-            }
         except Exception as e:
             logger.error(f"Unexpected error executing command: {command} - Error: {e}")
             return {
@@ -128,9 +277,75 @@ class CommandExecutor:
                 'command': command
             }
     
+    def parse_batch(self, text: str) -> Tuple[List[str], Optional[str]]:
+        """Split 'cmd1 ; cmd2' into commands, checking each one against the whitelist"""
+        commands = [command.strip() for command in text.split(';') if command.strip()]
+        if not commands:
+            return [], "No commands provided"
+        
+        if len(commands) > BATCH_MAX_COMMANDS:
+            return [], f"Too many commands ({len(commands)}), limit is {BATCH_MAX_COMMANDS}"
+        
+        for command in commands:
+            allowed, reason = self.is_command_allowed(command)
+            if not allowed:
+                return [], f"`{command}`: {reason}"
+        
+        return commands, None
+    
+    def get_saved_batch(self, name: str) -> Optional[List[str]]:
+        """Get the commands of a saved batch"""
+        commands = SAVED_BATCHES.get(name)
+        return list(commands) if commands is not None else None
+    
+    def format_batch_result(self, results: List[Dict], elapsed: float, title: str = "Batch") -> str:
+        """Merge batch results into one compact message, in the original order"""
+        message = f"📦 **{title}** ({len(results)} commands, {elapsed:.2f}s)\n\n"
+        
+        items = []
+        for result in results:
+            usage = result.get('usage')
+            timing = f" ({usage['wall_time']:.2f}s)" if usage else ""
+            
+            if result.get('success'):
+                header = f"✅ `{result['command']}`{timing}\n"
+                output = result.get('stdout') or result.get('stderr')
+            else:
+                error = result.get('error') or f"Return code {result.get('return_code')}"
+                header = f"❌ `{result['command']}`{timing}\n{error}\n"
+                output = result.get('stderr') or result.get('stdout')
+            items.append((header, (output or '').strip('\n')))
+        
+        # Share what is left after headers and code fences between the outputs
+        fence = len("```\n\n```\n") + len("\n... (truncated)")
+        budget = self.max_output_length - len(message) - sum(
+            len(header) + (fence if output else 0) for header, output in items
+        )
+        budgets = self._share_budget([len(output) for _, output in items], max(0, budget))
+        
+        for (header, output), limit in zip(items, budgets):
+            message += header
+            if output and limit > 0:
+                if len(output) > limit:
+                    output = output[:limit] + "\n... (truncated)"
+                message += f"```\n{output}\n```\n"
+        
+        return message
+    
+    def _share_budget(self, lengths: List[int], budget: int) -> List[int]:
+        """Split a character budget so short outputs fit whole and long ones share the rest"""
+        limits = [0] * len(lengths)
+        pending = sorted((length, i) for i, length in enumerate(lengths) if length)
+        while pending:
+            share = budget // len(pending)
+            length, i = pending.pop(0)
+            limits[i] = min(length, share)
+            budget -= limits[i]
+        return limits
+    
     def get_allowed_commands(self) -> List[str]:
         """Get list of allowed commands"""
-        return ALLOWED_COMMANDS.copy()
+        return sorted(get_config().allowed_commands)
     
     def format_command_result(self, result: Dict) -> str:
         """Format command execution result for display"""
@@ -139,6 +354,9 @@ class CommandExecutor:
             message += f"**Command:** `{result.get('command', 'unknown')}`\n"
             message += f"**Error:** {result.get('error', 'Unknown error')}\n"
             
+            if result.get('usage'):
+                message += self.format_usage(result['usage'])
+            
             if result.get('stderr'):
                 message += f"**Error Output:**\n```\n{result['stderr']}\n```"
             
@@ -150,6 +368,9 @@ class CommandExecutor:
         if result.get('return_code') is not None:
             message += f"**Return Code:** {result['return_code']}\n"
         
+        if result.get('usage'):
+            message += self.format_usage(result['usage'])
+        
         if result.get('stdout'):
             message += f"**Output:**\n```\n{result['stdout']}\n```"
         
@@ -158,6 +379,46 @@ class CommandExecutor:
         
         return message
     
+    def format_usage(self, usage: Dict) -> str:
+        """Format the resource usage of one execution"""
+        return (
+            f"**Resources:** {usage['wall_time']:.2f}s wall, "
+            f"{usage['user_time']:.2f}s user, {usage['system_time']:.2f}s sys, "
+            f"{self._format_peak(usage['max_rss'])}\n"
+        )
+    
+    def _format_peak(self, max_rss: Optional[int]) -> str:
+        if not max_rss:
+            return "peak memory not sampled"
+        return f"{max_rss / 1024**2:.1f} MB peak"
+    
+    def format_command_stats(self, limit: int = 5) -> str:
+        """Format the heaviest commands and users by total CPU time"""
+        if not self.stats_by_command:
+            return "📈 **Command Stats**\n\nNo commands executed yet."
+        
+        message = "📈 **Command Stats**\n\n"
+        with self.stats_lock:
+            tables = (
+                ("Heaviest commands", dict(self.stats_by_command)),
+                ("Heaviest users", dict(self.stats_by_user)),
+            )
+        
+        for title, table in tables:
+            if not table:
+                continue
+            message += f"**{title}:**\n"
+            ranked = sorted(table.items(), key=lambda item: item[1]['cpu_time'], reverse=True)
+            for key, entry in ranked[:limit]:
+                message += (
+                    f"• `{key}`: {entry['count']} runs, "
+                    f"{entry['cpu_time']:.2f}s CPU, {entry['wall_time']:.1f}s wall, "
+                    f"{self._format_peak(entry['max_rss'])}\n"
+                )
+            message += "\n"
+        
+        return message
+    
     def get_common_commands_help(self) -> str:
         """Get help text with common useful commands"""
         help_text = "🔧 **Available Commands**\n\n"
@@ -183,7 +444,7 @@ class CommandExecutor:
         help_text += "• `ping -c 4 google.com` - Network test\n"
         help_text += "• `wget --spider google.com` - Connection test\n\n"
         
-        help_text += f"**Security:** Only {len(ALLOWED_COMMANDS)} whitelisted commands allowed.\n"
+        help_text += f"**Security:** Only {len(get_config().allowed_commands)} whitelisted commands allowed.\n"
         help_text += "**Timeout:** Commands timeout after 30 seconds.\n"
         
         return help_text
@@ -0,0 +1,162 @@
+import os
+import re
+import json
+import hashlib
+import logging
+import random
+from typing import Dict, List, Optional
+from config.config import (
+    SCHEDULES_FILE, SCHEDULE_MIN_INTERVAL, SCHEDULE_MAX_PER_USER, SCHEDULE_MAX_JITTER
+)
+
+logger = logging.getLogger(__name__)
+
+INTERVAL_RE = re.compile(r'^(\d+)([smhd]?)$')
+INTERVAL_UNITS = {'': 1, 's': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_interval(text: str) -> Optional[int]:
+    """Parse an interval like '90', '30s', '5m', '1h' or '1d' into seconds"""
+    match = INTERVAL_RE.match(text.strip().lower())
+    if not match:
+        return None
+    return int(match.group(1)) * INTERVAL_UNITS[match.group(2)]
+
+
+def format_interval(seconds: int) -> str:
+    """Format seconds as the largest whole unit"""
+    for unit, size in (('d', 86400), ('h', 3600), ('m', 60)):
+        if seconds % size == 0:
+            return f"{seconds // size}{unit}"
+    return f"{seconds}s"
+
+
+class CommandScheduler:
+    def __init__(self, path: str = SCHEDULES_FILE):
+        self.path = path
+        self.schedules: Dict[int, Dict] = {}
+        self.next_id = 1
+        self.load()
+
+    def load(self):
+        """Load persisted schedules"""
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (ValueError, OSError) as e:
+            logger.error(f"Error loading schedules from {self.path}: {e}")
+            return
+
+        for schedule in data.get('schedules', []):
+            self.schedules[schedule['id']] = schedule
+        self.next_id = max(data.get('next_id', 1), max(self.schedules, default=0) + 1)
+
+    def save(self):
+        """Persist schedules, replacing the file atomically"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump({
+                    'next_id': self.next_id,
+                    'schedules': list(self.schedules.values())
+                }, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.error(f"Error saving schedules to {self.path}: {e}")
+
+    def add_schedule(self, user_id: int, chat_id: int, interval: int, command: str) -> Dict:
+        """Add a new schedule for a user"""
+        if interval < SCHEDULE_MIN_INTERVAL:
+            return {
+                'success': False,
+                'error': f"Interval must be at least {format_interval(SCHEDULE_MIN_INTERVAL)}"
+            }
+
+        if len(self.get_user_schedules(user_id)) >= SCHEDULE_MAX_PER_USER:
+            return {
+                'success': False,
+                'error': f"Limit of {SCHEDULE_MAX_PER_USER} schedules per user reached"
+            }
+
+        schedule = {
+            'id': self.next_id,
+            'user_id': user_id,
+            'chat_id': chat_id,
+            'interval': interval,
+            'command': command,
+            'last_hash': None
+        }
+        self.schedules[schedule['id']] = schedule
+        self.next_id += 1
+        self.save()
+
+        return {'success': True, 'schedule': schedule}
+
+    def remove_schedule(self, schedule_id: int, user_id: int) -> bool:
+        """Remove a schedule owned by the user"""
+        schedule = self.schedules.get(schedule_id)
+        if not schedule or schedule['user_id'] != user_id:
+            return False
+
+        del self.schedules[schedule_id]
+        self.save()
+        return True
+
+    def get_schedule(self, schedule_id: int) -> Optional[Dict]:
+        """Get a schedule by id"""
+        return self.schedules.get(schedule_id)
+
+    def get_schedules(self) -> List[Dict]:
+        """Get all schedules"""
+        return list(self.schedules.values())
+
+    def get_user_schedules(self, user_id: int) -> List[Dict]:
+        """Get schedules owned by a user"""
+        return [s for s in self.schedules.values() if s['user_id'] == user_id]
+
+    def get_first_delay(self, interval: int) -> float:
+        """Random start offset so jobs created together don't run together"""
+        return random.uniform(1, max(1, min(interval, SCHEDULE_MAX_JITTER)))
+
+    def get_jitter(self, interval: int) -> int:
+        """Per-run jitter applied by the job queue"""
+        return min(interval // 10, SCHEDULE_MAX_JITTER)
+
+    def hash_result(self, result: Dict) -> str:
+        """Hash the normalized output of a command result"""
+        parts = [str(result.get('return_code')), result.get('error', '')]
+        for stream in ('stdout', 'stderr'):
+            lines = (line.strip() for line in result.get(stream, '').splitlines())
+            parts.append('\n'.join(line for line in lines if line))
+        return hashlib.sha256('\0'.join(parts).encode('utf-8')).hexdigest()
+
+    def is_new_result(self, schedule_id: int, result_hash: str) -> bool:
+        """Check a result hash against the last reported one"""
+        schedule = self.schedules.get(schedule_id)
+        return bool(schedule) and result_hash != schedule['last_hash']
+
+    def record_result(self, schedule_id: int, result_hash: str):
+        """Store the hash of a result once it has been reported"""
+        schedule = self.schedules.get(schedule_id)
+        if not schedule:
+            return
+
+        schedule['last_hash'] = result_hash
+        self.save()
+
+    def format_schedules(self, schedules: List[Dict]) -> str:
+        """Format a list of schedules for display"""
+        if not schedules:
+            return "📅 **Schedules**\n\nNo scheduled commands.\nUse `/schedule <interval> <command>` to add one."
+
+        message = "📅 **Schedules**\n\n"
+        for schedule in schedules:
+            message += f"`#{schedule['id']}` every {format_interval(schedule['interval'])}: `{schedule['command']}`\n"
+        message += "\nRemove with `/unschedule <id>`."
+        return message
@@ -0,0 +1,88 @@
+import time
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from config.config import WATCH_TTL
+
+logger = logging.getLogger(__name__)
+
+
+class DashboardManager:
+    def __init__(self, temp_monitor, system_monitor):
+        self.temp_monitor = temp_monitor
+        self.system_monitor = system_monitor
+        self.watchers: Dict[int, Dict] = {}  # chat_id -> watcher
+
+    def add_watcher(self, chat_id: int, message_id: Optional[int], interval: int, body: str) -> Dict:
+        """Start refreshing a dashboard message, replacing any previous one in the chat"""
+        now = time.monotonic()
+        watcher = {
+            'chat_id': chat_id,
+            'message_id': message_id,
+            'interval': interval,
+            'next_update': now + interval,
+            'expires': now + WATCH_TTL,
+            'stops_at': datetime.now() + timedelta(seconds=WATCH_TTL),
+            'last_text': None
+        }
+        watcher['last_text'] = self.render_watcher(body, watcher)
+        self.watchers[chat_id] = watcher
+        return watcher
+
+    def remove_watcher(self, chat_id: int) -> Optional[Dict]:
+        """Stop refreshing the dashboard of a chat"""
+        return self.watchers.pop(chat_id, None)
+
+    def pop_expired(self, now: float) -> List[Dict]:
+        """Remove and return watchers whose TTL has passed"""
+        expired = [w for w in self.watchers.values() if w['expires'] <= now]
+        for watcher in expired:
+            del self.watchers[watcher['chat_id']]
+        return expired
+
+    def get_due_watchers(self, now: float) -> List[Dict]:
+        """Get watchers that should be refreshed this tick"""
+        # Watchers whose message is still being sent have no message_id yet
+        due = [w for w in self.watchers.values()
+               if w['message_id'] is not None and w['next_update'] <= now]
+        for watcher in due:
+            watcher['next_update'] = now + watcher['interval']
+        return due
+
+    def render_snapshot(self) -> str:
+        """Collect one snapshot and render the shared dashboard body"""
+        thermal = self.temp_monitor.get_temperature_status()
+        # Non-blocking sample: usage since the previous refresh
+        cpu = self.system_monitor.get_cpu_usage(interval=None)
+        mem = self.system_monitor.get_memory_usage()
+        uptime_data = self.system_monitor.get_system_uptime()
+
+        body = "📺 **Live Dashboard**\n\n"
+
+        if thermal.ok:
+            temp_emoji = "🔥" if thermal.critical else "⚠️" if thermal.warning else "✅"
+            body += f"{temp_emoji} **Temp:** {thermal.cpu_temp:.1f}°C\n"
+
+        if cpu.ok:
+            cpu_emoji = "⚠️" if cpu.warning else "✅"
+            body += f"{cpu_emoji} **CPU:** {cpu.overall:.0f}%"
+            if cpu.per_core:
+                body += " (" + " ".join(f"{core:.0f}" for core in cpu.per_core) + ")"
+            body += "\n"
+            if cpu.freq_current:
+                body += f"⚡ **Frequency:** {cpu.freq_current:.0f} MHz\n"
+
+        if mem.ok:
+            mem_emoji = "⚠️" if mem.warning else "✅"
+            body += f"{mem_emoji} **Memory:** {mem.percent:.1f}%\n"
+
+        if 'error' not in uptime_data:
+            # Minute resolution so the text doesn't change on every tick
+            body += f"⏱️ **Uptime:** {uptime_data['uptime_formatted'].rsplit(':', 1)[0]}\n"
+
+        return body
+
+    def render_watcher(self, body: str, watcher: Dict) -> str:
+        """Add the per-watcher footer to the shared body"""
+        footer = f"\n🔄 Every {watcher['interval']}s until {watcher['stops_at'].strftime('%H:%M')} · `/unwatch` to stop"
+        return body + footer
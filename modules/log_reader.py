@@ -0,0 +1,202 @@
+import mmap
+import os
+import re
+import logging
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Pattern, Tuple
+from config.config import (
+    ALLOWED_LOG_FILES, LOG_UNIT_SOURCE, LOG_DEFAULT_LINES,
+    LOG_MAX_LINES, LOG_MAX_SCAN_BYTES, LOG_READ_BLOCK_SIZE
+)
+
+logger = logging.getLogger(__name__)
+
+UNIT_NAME_RE = re.compile(r'^[A-Za-z0-9_.@-]+$')
+
+
+@lru_cache(maxsize=32)
+def compile_pattern(pattern: str) -> Pattern[bytes]:
+    """Compile a search pattern once and reuse it for later searches"""
+    return re.compile(pattern.encode('utf-8'), re.IGNORECASE)
+
+
+class LogReader:
+    def __init__(self):
+        self.max_output_length = 4000  # Telegram message limit consideration
+        self.max_line_length = 500
+        self.block_size = LOG_READ_BLOCK_SIZE
+        self.max_scan_bytes = LOG_MAX_SCAN_BYTES
+
+    def resolve_source(self, source: str) -> Tuple[Optional[str], Optional[str]]:
+        """Map a log name, whitelisted path or unit name to (path, unit)"""
+        if source in ALLOWED_LOG_FILES:
+            return ALLOWED_LOG_FILES[source], None
+
+        if source in ALLOWED_LOG_FILES.values():
+            return source, None
+
+        # Anything else is treated as a syslog identifier (e.g. "cron", "dhcpcd")
+        if UNIT_NAME_RE.match(source):
+            unit = source[:-len('.service')] if source.endswith('.service') else source
+            return LOG_UNIT_SOURCE, unit
+
+        return None, None
+
+    def iter_lines_reverse(self, path: str) -> Iterator[bytes]:
+        """Yield lines of a file from last to first, reading from the end"""
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return
+
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (ValueError, OSError):
+                # Some files (pipes, special filesystems) can't be mapped
+                yield from self._iter_blocks_reverse(f, size)
+                return
+
+            try:
+                yield from self._iter_mmap_reverse(mm)
+            finally:
+                mm.close()
+
+    def _iter_mmap_reverse(self, mm: mmap.mmap) -> Iterator[bytes]:
+        """Walk a memory-mapped file backwards one line at a time"""
+        end = len(mm)
+        stop = max(0, end - self.max_scan_bytes)
+
+        while end > stop:
+            start = mm.rfind(b'\n', stop, end)
+            if start < 0:
+                # Only yield the first line if it was not cut by the scan limit
+                if stop == 0:
+                    yield mm[0:end]
+                return
+            yield mm[start + 1:end]
+            end = start
+
+    def _iter_blocks_reverse(self, f, size: int) -> Iterator[bytes]:
+        """Walk a file backwards in fixed-size blocks"""
+        pos = size
+        stop = max(0, size - self.max_scan_bytes)
+        remainder = b''
+
+        while pos > stop:
+            read_size = min(self.block_size, pos - stop)
+            pos -= read_size
+            f.seek(pos)
+            lines = (f.read(read_size) + remainder).split(b'\n')
+            remainder = lines[0]
+            for line in reversed(lines[1:]):
+                yield line
+
+        if stop == 0:
+            yield remainder
+
+    def tail(self, source: str, pattern: Optional[str] = None,
+             lines: int = LOG_DEFAULT_LINES) -> Dict:
+        """Get the last matching lines of a whitelisted log"""
+        path, unit = self.resolve_source(source)
+        if path is None:
+            return {
+                'success': False,
+                'error': f"Log '{source}' not allowed",
+                'source': source
+            }
+
+        lines = max(1, min(lines, LOG_MAX_LINES))
+
+        try:
+            regex = compile_pattern(pattern) if pattern else None
+        except re.error as e:
+            return {
+                'success': False,
+                'error': f"Invalid pattern: {e}",
+                'source': source
+            }
+
+        unit_markers = None
+        if unit:
+            unit_bytes = unit.encode('utf-8')
+            unit_markers = (b' ' + unit_bytes + b'[', b' ' + unit_bytes + b':')
+
+        matched: List[bytes] = []
+        try:
+            for line in self.iter_lines_reverse(path):
+                if not line:
+                    continue
+                if unit_markers and unit_markers[0] not in line and unit_markers[1] not in line:
+                    continue
+                if regex and not regex.search(line):
+                    continue
+                matched.append(line[:self.max_line_length])
+                if len(matched) >= lines:
+                    break
+        except (FileNotFoundError, PermissionError) as e:
+            logger.warning(f"Cannot read log {path}: {e}")
+            return {
+                'success': False,
+                'error': f"Cannot read {path}: {e.strerror}",
+                'source': source
+            }
+        except Exception as e:
+            logger.error(f"Unexpected error reading log {path}: {e}")
+            return {
+                'success': False,
+                'error': f"Unexpected error: {str(e)}",
+                'source': source
+            }
+
+        matched.reverse()
+        output = '\n'.join(line.decode('utf-8', errors='replace') for line in matched)
+
+        # Keep the newest lines when the output is too long
+        if len(output) > self.max_output_length:
+            output = "... (older lines truncated)\n" + output[-self.max_output_length:]
+
+        return {
+            'success': True,
+            'source': source,
+            'path': path,
+            'unit': unit,
+            'pattern': pattern,
+            'count': len(matched),
+            'output': output
+        }
+
+    def format_log_result(self, result: Dict) -> str:
+        """Format log tail result for display"""
+        if not result.get('success'):
+            message = f"❌ **Log Read Failed**\n"
+            message += f"**Log:** `{result.get('source', 'unknown')}`\n"
+            message += f"**Error:** {result.get('error', 'Unknown error')}\n"
+            return message
+
+        message = f"📜 **Log:** `{result['path']}`\n"
+        if result.get('unit'):
+            message += f"**Unit:** `{result['unit']}`\n"
+        if result.get('pattern'):
+            message += f"**Pattern:** `{result['pattern']}`\n"
+        message += f"**Lines:** {result['count']}\n"
+
+        if result.get('output'):
+            message += f"```\n{result['output']}\n```"
+        else:
+            message += "No matching lines found.\n"
+
+        return message
+
+    def get_logs_help(self) -> str:
+        """Get help text for the /logs command"""
+        help_text = "📜 **Log Viewer**\n\n"
+        help_text += "**Usage:** `/logs <file|unit> [pattern] [lines]`\n\n"
+        help_text += "**Available logs:**\n"
+        for name, path in ALLOWED_LOG_FILES.items():
+            help_text += f"• `{name}` - {path}\n"
+        help_text += f"\nOther names are matched as units in `{LOG_UNIT_SOURCE}`.\n\n"
+        help_text += "**Examples:**\n"
+        help_text += "`/logs bot`\n"
+        help_text += "`/logs syslog error 50`\n"
+        help_text += "`/logs auth Failed`\n"
+        return help_text
@@ -0,0 +1,303 @@
+import os
+import csv
+import gzip
+import json
+import math
+import time
+import struct
+import sys
+import logging
+import tempfile
+import psutil
+from array import array
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, Tuple
+from config.config import METRICS_DIR, METRICS_RETENTION_DAYS, METRICS_EXPORT_MAX_POINTS, TEMP_SAMPLE_SLOW
+
+logger = logging.getLogger(__name__)
+
+# name -> (description, aggregation used when downsampling)
+METRICS = {
+    'cpu': ('CPU usage %', 'mean'),
+    'memory': ('Memory usage %', 'mean'),
+    'swap': ('Swap usage %', 'mean'),
+    'disk': ('Root filesystem usage %', 'mean'),
+    'temp': ('CPU temperature °C', 'mean'),
+    'net_sent': ('Bytes sent (counter)', 'last'),
+    'net_recv': ('Bytes received (counter)', 'last'),
+}
+COLUMNS = ('timestamp',) + tuple(METRICS)
+
+BINARY_MAGIC = b'PIMX'
+BINARY_VERSION = 2
+BINARY_BLOCK_ROWS = 1024
+
+
+class MetricsStore:
+    """Append-only daily CSV files of sampled metrics, exported on demand.
+
+    Binary exports are gzip-compressed and columnar, written in blocks so
+    memory stays bounded:
+
+        b'PIMX', uint8 version, uint16 header length, JSON header
+        per block: uint32 rows, float64[rows] timestamps, then per metric
+        float64[rows] for counters ('last' metrics) or float32[rows] for the rest
+        a block with 0 rows ends the file; missing values are NaN
+
+    The header's 'types' lists the array typecode of each column. Byte
+    counters need float64: float32 only resolves 8 KiB steps near 1e11.
+    """
+
+    def __init__(self, temp_monitor, system_monitor, directory: str = METRICS_DIR):
+        self.temp_monitor = temp_monitor
+        self.system_monitor = system_monitor
+        self.directory = directory
+        self.last_cpu_times = psutil.cpu_times()  # Own baseline, independent of /watch
+
+    def get_day_path(self, day: datetime) -> str:
+        return os.path.join(self.directory, f"{day.strftime('%Y-%m-%d')}.csv")
+
+    def collect_sample(self) -> Dict:
+        """Sample the monitors and append one row"""
+        mem = self.system_monitor.get_memory_usage()
+        disk = self.system_monitor.get_disk_usage()
+        net = self.system_monitor.get_network_stats(include_connections=False)
+        # Reuse the adaptive monitoring sample rather than running vcgencmd every time
+        temp = self.temp_monitor.get_recent_temperature(max_age=TEMP_SAMPLE_SLOW * 2)
+        if temp is None:
+            temp = self.temp_monitor.get_cpu_temperature()
+        root = disk.get('/') if disk.ok else None
+
+        row = {
+            'timestamp': time.time(),
+            'cpu': self.get_cpu_percent(),
+            'memory': mem.percent if mem.ok else None,
+            'swap': mem.swap_percent if mem.ok else None,
+            'disk': root.percent if root else None,
+            'temp': temp,
+            'net_sent': net.bytes_sent if net.ok else None,
+            'net_recv': net.bytes_recv if net.ok else None,
+        }
+        self.record(row)
+        return row
+
+    def get_cpu_percent(self) -> Optional[float]:
+        """CPU usage over the whole period since the previous sample"""
+        times = psutil.cpu_times()
+        previous, self.last_cpu_times = self.last_cpu_times, times
+
+        def busy_and_total(t) -> Tuple[float, float]:
+            # Guest time is already included in user time on Linux
+            total = sum(t) - getattr(t, 'guest', 0) - getattr(t, 'guest_nice', 0)
+            return total - t.idle - getattr(t, 'iowait', 0), total
+
+        busy, total = busy_and_total(times)
+        previous_busy, previous_total = busy_and_total(previous)
+        if total <= previous_total:
+            return None
+        return min(100.0, max(0.0, 100 * (busy - previous_busy) / (total - previous_total)))
+
+    def record(self, row: Dict):
+        """Append a row to today's file"""
+        day = datetime.fromtimestamp(row['timestamp'], timezone.utc)
+        path = self.get_day_path(day)
+        new_file = not os.path.exists(path)
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(path, 'a', newline='') as f:
+                writer = csv.writer(f)
+                if new_file:
+                    writer.writerow(COLUMNS)
+                writer.writerow([self._format_value(row.get(column)) for column in COLUMNS])
+        except OSError as e:
+            logger.error(f"Error recording metrics to {path}: {e}")
+            return
+
+        if new_file:
+            self.prune(day)
+
+    def _format_value(self, value) -> str:
+        if value is None:
+            return ''
+        if isinstance(value, float):
+            return f"{value:.3f}".rstrip('0').rstrip('.')
+        return str(value)
+
+    def prune(self, now: datetime):
+        """Delete day files older than the retention period"""
+        cutoff = (now - timedelta(days=METRICS_RETENTION_DAYS)).strftime('%Y-%m-%d')
+        try:
+            for name in os.listdir(self.directory):
+                if name.endswith('.csv') and name[:-4] < cutoff:
+                    os.remove(os.path.join(self.directory, name))
+        except OSError as e:
+            logger.error(f"Error pruning metrics in {self.directory}: {e}")
+
+    def iter_rows(self, start: float, end: float, metrics: List[str]) -> Iterator[Tuple]:
+        """Yield (timestamp, *metrics) rows in time order, one file line at a time"""
+        day = datetime.fromtimestamp(start, timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        last_day = datetime.fromtimestamp(end, timezone.utc)
+        last_timestamp = -math.inf
+
+        while day <= last_day:
+            path = self.get_day_path(day)
+            day += timedelta(days=1)
+            if not os.path.exists(path):
+                continue
+
+            with open(path, 'r', newline='') as f:
+                reader = csv.reader(f)
+                header = next(reader, None)
+                if not header:
+                    continue
+                # Look columns up by name so older files with fewer columns still work
+                indexes = [header.index(name) if name in header else None for name in ('timestamp',) + tuple(metrics)]
+
+                for line in reader:
+                    try:
+                        timestamp = float(line[indexes[0]])
+                    except (ValueError, IndexError):
+                        continue
+                    if timestamp < start or timestamp > end:
+                        continue
+                    # downsample needs sorted input; after the clock steps back
+                    # (e.g. NTP sync after boot) rows are dropped until it catches up
+                    if timestamp < last_timestamp:
+                        continue
+                    last_timestamp = timestamp
+                    # A torn row (power loss mid-append) yields None values
+                    yield (timestamp,) + tuple(
+                        self._parse_value(line[i]) if i is not None and i < len(line) else None
+                        for i in indexes[1:]
+                    )
+
+    def _parse_value(self, text: str) -> Optional[float]:
+        try:
+            return float(text) if text else None
+        except ValueError:
+            return None
+
+    def downsample(self, rows: Iterator[Tuple], resolution: float, metrics: List[str]) -> Iterator[Tuple]:
+        """Aggregate time-ordered rows into resolution-sized buckets without buffering the input"""
+        aggregations = [METRICS[name][1] for name in metrics]
+        bucket = None
+        sums = counts = lasts = None
+
+        for row in rows:
+            row_bucket = math.floor(row[0] / resolution)
+            if row_bucket != bucket:
+                if bucket is not None:
+                    yield self._emit_bucket(bucket * resolution, aggregations, sums, counts, lasts)
+                bucket = row_bucket
+                sums = [0.0] * len(metrics)
+                counts = [0] * len(metrics)
+                lasts = [None] * len(metrics)
+
+            for i, value in enumerate(row[1:]):
+                if value is not None:
+                    sums[i] += value
+                    counts[i] += 1
+                    lasts[i] = value
+
+        if bucket is not None:
+            yield self._emit_bucket(bucket * resolution, aggregations, sums, counts, lasts)
+
+    def _emit_bucket(self, timestamp: float, aggregations: List[str], sums, counts, lasts) -> Tuple:
+        values = []
+        for aggregation, total, count, last in zip(aggregations, sums, counts, lasts):
+            if aggregation == 'last':
+                values.append(last)
+            else:
+                values.append(total / count if count else None)
+        return (timestamp,) + tuple(values)
+
+    def get_resolution(self, window: float, resolution: Optional[float], sample_interval: float) -> float:
+        """Use the requested resolution, coarsened so the export stays under the point limit"""
+        minimum = window / METRICS_EXPORT_MAX_POINTS
+        resolution = max(resolution or sample_interval, minimum, 1)
+        # Whole multiples of the sample interval give every bucket the same number of samples
+        if sample_interval:
+            resolution = math.ceil(resolution / sample_interval) * sample_interval
+        return resolution
+
+    def export(self, metrics: List[str], window: float, resolution: float, fmt: str = 'csv') -> Tuple[str, int]:
+        """Write a gzip-compressed export to a temporary file, returning (path, rows)"""
+        end = time.time()
+        rows = self.downsample(self.iter_rows(end - window, end, metrics), resolution, metrics)
+
+        suffix = '.csv.gz' if fmt == 'csv' else '.pimx.gz'
+        fd, path = tempfile.mkstemp(prefix='metrics-', suffix=suffix)
+        os.close(fd)
+
+        try:
+            if fmt == 'csv':
+                count = self._write_csv(path, rows, metrics)
+            else:
+                count = self._write_binary(path, rows, metrics, resolution)
+        except Exception:
+            os.remove(path)
+            raise
+
+        return path, count
+
+    def _write_csv(self, path: str, rows: Iterator[Tuple], metrics: List[str]) -> int:
+        count = 0
+        with gzip.open(path, 'wt', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(('timestamp',) + tuple(metrics))
+            for row in rows:
+                writer.writerow([self._format_value(value) for value in row])
+                count += 1
+        return count
+
+    def _write_binary(self, path: str, rows: Iterator[Tuple], metrics: List[str], resolution: float) -> int:
+        header = json.dumps({
+            'columns': ['timestamp'] + list(metrics),
+            'types': [column.typecode for column in self._new_block(metrics)],
+            'resolution': resolution
+        }).encode('utf-8')
+
+        count = 0
+        with gzip.open(path, 'wb') as f:
+            f.write(BINARY_MAGIC + struct.pack('<BH', BINARY_VERSION, len(header)) + header)
+
+            columns = self._new_block(metrics)
+            for row in rows:
+                columns[0].append(row[0])
+                for column, value in zip(columns[1:], row[1:]):
+                    column.append(math.nan if value is None else value)
+                count += 1
+
+                if len(columns[0]) >= BINARY_BLOCK_ROWS:
+                    self._write_block(f, columns)
+                    columns = self._new_block(metrics)
+
+            if len(columns[0]):
+                self._write_block(f, columns)
+            f.write(struct.pack('<I', 0))
+
+        return count
+
+    def _new_block(self, metrics: List[str]) -> List[array]:
+        return [array('d')] + [array('d' if METRICS[name][1] == 'last' else 'f') for name in metrics]
+
+    def _write_block(self, f, columns: List[array]):
+        f.write(struct.pack('<I', len(columns[0])))
+        for column in columns:
+            if sys.byteorder == 'big':
+                column.byteswap()  # The format is little-endian
+            f.write(column.tobytes())
+
+    def get_metrics_help(self) -> str:
+        """Get help text for the /export command"""
+        help_text = "📤 **Metrics Export**\n\n"
+        help_text += "**Usage:** `/export <metrics|all> <window> [resolution] [csv|bin]`\n\n"
+        help_text += "**Metrics:**\n"
+        for name, (description, _) in METRICS.items():
+            help_text += f"• `{name}` - {description}\n"
+        help_text += "\n**Examples:**\n"
+        help_text += "`/export all 24h`\n"
+        help_text += "`/export cpu,temp 7d 1h`\n"
+        help_text += "`/export memory 6h 5m bin`\n"
+        return help_text
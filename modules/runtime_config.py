@@ -0,0 +1,124 @@
+import os
+import logging
+import threading
+from typing import Dict, FrozenSet, List, NamedTuple, Tuple
+import config.config as config_module
+
+logger = logging.getLogger(__name__)
+
+
+class RuntimeConfig(NamedTuple):
+    """Settings that can change without a restart, precomputed for the hot path"""
+    authorized_users: FrozenSet[int]
+    allowed_commands: FrozenSet[str]
+    rate_limit: int
+    temp_warning: float
+    temp_critical: float
+    cpu_warning: float
+    memory_warning: float
+    mtime: float = 0.0
+
+
+def validate_config(namespace: Dict) -> List[str]:
+    """Check reloadable settings, returning a list of problems"""
+    errors = []
+
+    users = namespace.get('AUTHORIZED_USERS')
+    if not isinstance(users, (list, tuple, set, frozenset)):
+        errors.append("AUTHORIZED_USERS must be a list")
+    elif not all(isinstance(user, int) and not isinstance(user, bool) for user in users):
+        errors.append("AUTHORIZED_USERS must only contain integer user IDs")
+
+    commands = namespace.get('ALLOWED_COMMANDS')
+    if not isinstance(commands, (list, tuple, set, frozenset)):
+        errors.append("ALLOWED_COMMANDS must be a list")
+    elif not all(isinstance(cmd, str) and cmd and not any(c.isspace() for c in cmd) for cmd in commands):
+        errors.append("ALLOWED_COMMANDS must only contain single command names")
+
+    rate_limit = namespace.get('RATE_LIMIT')
+    if not isinstance(rate_limit, int) or isinstance(rate_limit, bool) or rate_limit < 1:
+        errors.append("RATE_LIMIT must be a positive integer")
+
+    for name in ('TEMP_WARNING_THRESHOLD', 'TEMP_CRITICAL_THRESHOLD',
+                 'CPU_WARNING_THRESHOLD', 'MEMORY_WARNING_THRESHOLD'):
+        value = namespace.get(name)
+        if not isinstance(value, (int, float)) or isinstance(value, bool):
+            errors.append(f"{name} must be a number")
+        elif name in ('CPU_WARNING_THRESHOLD', 'MEMORY_WARNING_THRESHOLD') and not 0 < value <= 100:
+            errors.append(f"{name} must be a percentage between 0 and 100")
+
+    if not errors and namespace['TEMP_WARNING_THRESHOLD'] >= namespace['TEMP_CRITICAL_THRESHOLD']:
+        errors.append("TEMP_WARNING_THRESHOLD must be below TEMP_CRITICAL_THRESHOLD")
+
+    return errors
+
+
+def build_runtime_config(namespace: Dict, mtime: float = 0.0) -> RuntimeConfig:
+    """Validate settings and build the precomputed runtime config"""
+    errors = validate_config(namespace)
+    if errors:
+        raise ValueError('; '.join(errors))
+
+    return RuntimeConfig(
+        authorized_users=frozenset(namespace['AUTHORIZED_USERS']),
+        allowed_commands=frozenset(namespace['ALLOWED_COMMANDS']),
+        rate_limit=namespace['RATE_LIMIT'],
+        temp_warning=float(namespace['TEMP_WARNING_THRESHOLD']),
+        temp_critical=float(namespace['TEMP_CRITICAL_THRESHOLD']),
+        cpu_warning=float(namespace['CPU_WARNING_THRESHOLD']),
+        memory_warning=float(namespace['MEMORY_WARNING_THRESHOLD']),
+        mtime=mtime
+    )
+
+
+class ConfigManager:
+    def __init__(self, path: str = config_module.__file__):
+        self.path = path
+        self.lock = threading.Lock()  # Serializes reloads, readers never take it
+        self.current = build_runtime_config(vars(config_module), self.get_mtime())
+
+    def get_mtime(self) -> float:
+        try:
+            return os.stat(self.path).st_mtime
+        except OSError:
+            return 0.0
+
+    def has_changed(self) -> bool:
+        """Cheap check used by the file watcher"""
+        return self.get_mtime() != self.current.mtime
+
+    def reload(self) -> Tuple[bool, str]:
+        """Re-read the config file and swap in the new settings if they are valid"""
+        with self.lock:
+            mtime = self.get_mtime()
+            try:
+                with open(self.path, 'r') as f:
+                    source = f.read()
+                namespace = {'__file__': self.path, '__name__': config_module.__name__}
+                exec(compile(source, self.path, 'exec'), namespace)
+                new_config = build_runtime_config(namespace, mtime)
+                if not new_config.authorized_users:
+                    raise ValueError("AUTHORIZED_USERS is empty, refusing to lock everyone out")
+            except Exception as e:
+                # Remember the mtime so a broken file isn't retried on every check
+                self.current = self.current._replace(mtime=mtime)
+                logger.error(f"Config reload failed, keeping previous settings: {e}")
+                return False, str(e)
+
+            changed = [
+                field for field in RuntimeConfig._fields
+                if field != 'mtime' and getattr(new_config, field) != getattr(self.current, field)
+            ]
+            # A single reference swap: readers see either the old or the new config
+            self.current = new_config
+
+        logger.info(f"Config reloaded, changed: {', '.join(changed) or 'nothing'}")
+        return True, ', '.join(changed) or 'nothing changed'
+
+
+config_manager = ConfigManager()
+
+
+def get_config() -> RuntimeConfig:
+    """Get the current runtime config; hold on to it for the whole request"""
+    return config_manager.current
@@ -0,0 +1,97 @@
+from typing import NamedTuple, Optional, Tuple
+
+# Snapshots are NamedTuples: immutable, no per-instance __dict__, cheap to
+# create and to keep in history. Every snapshot carries an `error` field;
+# a failed reading is the same type with `error` set and `ok` False.
+
+
+class CpuSnapshot(NamedTuple):
+    timestamp: float = 0.0
+    overall: float = 0.0
+    per_core: Tuple[float, ...] = ()
+    cores: int = 0
+    freq_current: Optional[float] = None
+    freq_min: Optional[float] = None
+    freq_max: Optional[float] = None
+    warning: bool = False
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class MemorySnapshot(NamedTuple):
+    timestamp: float = 0.0
+    total: int = 0
+    available: int = 0
+    used: int = 0
+    free: int = 0
+    percent: float = 0.0
+    swap_total: int = 0
+    swap_used: int = 0
+    swap_free: int = 0
+    swap_percent: float = 0.0
+    warning: bool = False
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class PartitionUsage(NamedTuple):
+    mountpoint: str
+    device: str
+    fstype: str
+    total: int
+    used: int
+    free: int
+    percent: float
+
+
+class DiskSnapshot(NamedTuple):
+    timestamp: float = 0.0
+    partitions: Tuple[PartitionUsage, ...] = ()
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def get(self, mountpoint: str) -> Optional[PartitionUsage]:
+        """Get usage for a mountpoint, None if not mounted"""
+        for partition in self.partitions:
+            if partition.mountpoint == mountpoint:
+                return partition
+        return None
+
+
+class NetworkSnapshot(NamedTuple):
+    timestamp: float = 0.0
+    bytes_sent: int = 0
+    bytes_recv: int = 0
+    packets_sent: int = 0
+    packets_recv: int = 0
+    connections: int = 0
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class ThermalSnapshot(NamedTuple):
+    timestamp: float = 0.0
+    cpu_temp: Optional[float] = None
+    gpu_temp: Optional[float] = None
+    status: str = 'unknown'
+    warning: bool = False
+    critical: bool = False
+    trend: Optional[float] = None  # Celsius per minute
+    time_to_critical: Optional[float] = None  # Seconds
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
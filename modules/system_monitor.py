@@ -2,103 +2,108 @@
 import psutil
 import subprocess
 import logging
-from typing import Dict, List
+import time
+from typing import Dict, List, Optional
 from datetime import datetime, timedelta
-from config.config import CPU_WARNING_THRESHOLD, MEMORY_WARNING_THRESHOLD
+from modules.runtime_config import get_config
+from modules.snapshots import (
+    CpuSnapshot, MemorySnapshot, DiskSnapshot, PartitionUsage, NetworkSnapshot
+)
 
 logger = logging.getLogger(__name__)
 
 class SystemMonitor:
     def __init__(self):
         self.boot_time = datetime.fromtimestamp(psutil.boot_time())
+        self.cpu_count = psutil.cpu_count()
         
-    def get_cpu_usage(self) -> Dict:
-        """Get CPU usage statistics"""
+    def get_cpu_usage(self, interval: Optional[float] = 1) -> CpuSnapshot:
+        """Get CPU usage statistics (interval=None compares against the previous call)"""
         try:
             # Get CPU usage per core and overall
-            cpu_percent = psutil.cpu_percent(interval=1, percpu=True)
+            cpu_percent = psutil.cpu_percent(interval=interval, percpu=True)
             cpu_overall = psutil.cpu_percent(interval=0)
             cpu_freq = psutil.cpu_freq()
-            cpu_count = psutil.cpu_count()
             
-            return {
-                'overall': cpu_overall,
-                'per_core': cpu_percent,
-                'cores': cpu_count,
-                'frequency': {
-                    'current': cpu_freq.current if cpu_freq else None,
-                    'min': cpu_freq.min if cpu_freq else None,
-                    'max': cpu_freq.max if cpu_freq else None
-                },
-                'warning': cpu_overall >= CPU_WARNING_THRESHOLD
-            }
+            return CpuSnapshot(
+                timestamp=time.time(),
+                overall=cpu_overall,
+                per_core=tuple(cpu_percent),
+                cores=self.cpu_count,
+                freq_current=cpu_freq.current if cpu_freq else None,
+                freq_min=cpu_freq.min if cpu_freq else None,
+                freq_max=cpu_freq.max if cpu_freq else None,
+                warning=cpu_overall >= get_config().cpu_warning
+            )
         except Exception as e:
             logger.error(f"Error getting CPU usage: {e}")
-            return {'error': str(e)}
+            return CpuSnapshot(timestamp=time.time(), error=str(e))
     
-    def get_memory_usage(self) -> Dict:
+    def get_memory_usage(self) -> MemorySnapshot:
         """Get memory usage statistics"""
         try:
             memory = psutil.virtual_memory()
             swap = psutil.swap_memory()
             
-            return {
-                'total': memory.total,
-                'available': memory.available,
-                'used': memory.used,
-                'free': memory.free,
-                'percent': memory.percent,
-                'swap_total': swap.total,
-                'swap_used': swap.used,
-                'swap_free': swap.free,
-                'swap_percent': swap.percent,
-                'warning': memory.percent >= MEMORY_WARNING_THRESHOLD
-            }
+            return MemorySnapshot(
+                timestamp=time.time(),
+                total=memory.total,
+                available=memory.available,
+                used=memory.used,
+                free=memory.free,
+                percent=memory.percent,
+                swap_total=swap.total,
+                swap_used=swap.used,
+                swap_free=swap.free,
+                swap_percent=swap.percent,
+                warning=memory.percent >= get_config().memory_warning
+            )
         except Exception as e:
             logger.error(f"Error getting memory usage: {e}")
-            return {'error': str(e)}
+            return MemorySnapshot(timestamp=time.time(), error=str(e))
     
-    def get_disk_usage(self) -> Dict:
+    def get_disk_usage(self) -> DiskSnapshot:
         """Get disk usage statistics"""
         try:
-            disk_usage = {}
-            partitions = psutil.disk_partitions()
+            partitions = []
             
-            for partition in partitions:
+            for partition in psutil.disk_partitions():
                 try:
                     usage = psutil.disk_usage(partition.mountpoint)
-                    disk_usage[partition.mountpoint] = {
-                        'device': partition.device,
-                        'fstype': partition.fstype,
-                        'total': usage.total,
-                        'used': usage.used,
-                        'free': usage.free,
-                        'percent': (usage.used / usage.total) * 100
-                    }
+                    partitions.append(PartitionUsage(
+                        mountpoint=partition.mountpoint,
+                        device=partition.device,
+                        fstype=partition.fstype,
+                        total=usage.total,
+                        used=usage.used,
+                        free=usage.free,
+                        percent=(usage.used / usage.total) * 100
+                    ))
                 except PermissionError:
                     continue
             
-            return disk_usage
+            return DiskSnapshot(timestamp=time.time(), partitions=tuple(partitions))
         except Exception as e:
             logger.error(f"Error getting disk usage: {e}")
-            return {'error': str(e)}
+            return DiskSnapshot(timestamp=time.time(), error=str(e))
     
-    def get_network_stats(self) -> Dict:
-        """Get network statistics"""
+    def get_network_stats(self, include_connections: bool = True) -> NetworkSnapshot:
+        """Get network statistics (counting connections scans every socket)"""
         try:
             net_io = psutil.net_io_counters()
-            net_connections = len(psutil.net_connections())
+            net_connections = len(psutil.net_connections()) if include_connections else 0
             
-            return {
-                'bytes_sent': net_io.bytes_sent,
-                'bytes_recv': net_io.bytes_recv,
-                'packets_sent': net_io.packets_sent,
-                'packets_recv': net_io.packets_recv,
-                'connections': net_connections
-            }
+            return NetworkSnapshot(
+                timestamp=time.time(),
+                bytes_sent=net_io.bytes_sent,
+                bytes_recv=net_io.bytes_recv,
+                packets_sent=net_io.packets_sent,
+                packets_recv=net_io.packets_recv,
+                connections=net_connections
+            )
         except Exception as e:
             logger.error(f"Error getting network stats: {e}")
-            return {'error': str(e)}
+            return NetworkSnapshot(timestamp=time.time(), error=str(e))
     
     def get_system_uptime(self) -> Dict:
         """Get system uptime"""
@@ -168,36 +173,36 @@ class SystemMonitor:
         report = "💻 **System Status Report**\n\n"
         
         # CPU Usage
-        cpu_data = self.get_cpu_usage()
-        if 'error' not in cpu_data:
-            cpu_emoji = "⚠️" if cpu_data.get('warning') else "✅"
-            report += f"{cpu_emoji} **CPU Usage:** {cpu_data['overall']:.1f}%\n"
-            report += f"🔧 **Cores:** {cpu_data['cores']}\n"
-            if cpu_data['frequency']['current']:
-                report += f"⚡ **Frequency:** {cpu_data['frequency']['current']:.0f} MHz\n"
+        cpu = self.get_cpu_usage()
+        if cpu.ok:
+            cpu_emoji = "⚠️" if cpu.warning else "✅"
+            report += f"{cpu_emoji} **CPU Usage:** {cpu.overall:.1f}%\n"
+            report += f"🔧 **Cores:** {cpu.cores}\n"
+            if cpu.freq_current:
+                report += f"⚡ **Frequency:** {cpu.freq_current:.0f} MHz\n"
         
         # Memory Usage
-        mem_data = self.get_memory_usage()
-        if 'error' not in mem_data:
-            mem_emoji = "⚠️" if mem_data.get('warning') else "✅"
-            mem_gb = mem_data['used'] / (1024**3)
-            mem_total_gb = mem_data['total'] / (1024**3)
-            report += f"{mem_emoji} **Memory:** {mem_gb:.1f}/{mem_total_gb:.1f} GB ({mem_data['percent']:.1f}%)\n"
+        mem = self.get_memory_usage()
+        if mem.ok:
+            mem_emoji = "⚠️" if mem.warning else "✅"
+            mem_gb = mem.used / (1024**3)
+            mem_total_gb = mem.total / (1024**3)
+            report += f"{mem_emoji} **Memory:** {mem_gb:.1f}/{mem_total_gb:.1f} GB ({mem.percent:.1f}%)\n"
             
-            if mem_data['swap_total'] > 0:
-                swap_gb = mem_data['swap_used'] / (1024**3)
-                swap_total_gb = mem_data['swap_total'] / (1024**3)
-                report += f"💾 **Swap:** {swap_gb:.1f}/{swap_total_gb:.1f} GB ({mem_data['swap_percent']:.1f}%)\n"
+            if mem.swap_total > 0:
+                swap_gb = mem.swap_used / (1024**3)
+                swap_total_gb = mem.swap_total / (1024**3)
+                report += f"💾 **Swap:** {swap_gb:.1f}/{swap_total_gb:.1f} GB ({mem.swap_percent:.1f}%)\n"
         
         # Disk Usage
-        disk_data = self.get_disk_usage()
-        if 'error' not in disk_data and disk_data:
+        disk = self.get_disk_usage()
+        if disk.ok and disk.partitions:
             report += "\n💽 **Disk Usage:**\n"
-            for mount, data in disk_data.items():
-                if mount in ['/', '/boot']:  # Show main partitions
-                    used_gb = data['used'] / (1024**3)
-                    total_gb = data['total'] / (1024**3)
-                    report += f"  {mount}: {used_gb:.1f}/{total_gb:.1f} GB ({data['percent']:.1f}%)\n"
+            for partition in disk.partitions:
+                if partition.mountpoint in ['/', '/boot']:  # Show main partitions
+                    used_gb = partition.used / (1024**3)
+                    total_gb = partition.total / (1024**3)
+                    report += f"  {partition.mountpoint}: {used_gb:.1f}/{total_gb:.1f} GB ({partition.percent:.1f}%)\n"
         
         # Uptime
         uptime_data = self.get_system_uptime()
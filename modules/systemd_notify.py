@@ -0,0 +1,101 @@
+import os
+import time
+import socket
+import asyncio
+import logging
+from typing import Optional, Tuple
+from config.config import WATCHDOG_MAX_LOOP_LAG
+
+logger = logging.getLogger(__name__)
+
+
+class SystemdNotifier:
+    """Minimal sd_notify(3) client; does nothing when not started by systemd"""
+
+    def __init__(self, address: Optional[str] = None):
+        address = address or os.getenv('NOTIFY_SOCKET')
+        # A leading '@' means an abstract socket
+        if address and address.startswith('@'):
+            address = '\0' + address[1:]
+        self.address = address
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) if address else None
+
+    @property
+    def enabled(self) -> bool:
+        return self.socket is not None
+
+    def notify(self, *fields: str) -> bool:
+        """Send state fields like 'READY=1' to the service manager"""
+        if not self.socket:
+            return False
+        try:
+            self.socket.sendto('\n'.join(fields).encode('utf-8'), self.address)
+            return True
+        except OSError as e:
+            logger.warning(f"Failed to notify systemd: {e}")
+            return False
+
+    def ready(self, status: Optional[str] = None) -> bool:
+        return self.notify('READY=1', *([f"STATUS={status}"] if status else []))
+
+    def watchdog(self, status: Optional[str] = None) -> bool:
+        return self.notify('WATCHDOG=1', *([f"STATUS={status}"] if status else []))
+
+    def status(self, status: str) -> bool:
+        return self.notify(f"STATUS={status}")
+
+    def stopping(self) -> bool:
+        return self.notify('STOPPING=1')
+
+    def get_watchdog_interval(self) -> Optional[float]:
+        """Seconds between pings (half of WatchdogSec), None if the watchdog is off"""
+        pid = os.getenv('WATCHDOG_PID')
+        if pid and pid != str(os.getpid()):
+            return None
+        try:
+            usec = int(os.getenv('WATCHDOG_USEC', '0'))
+        except ValueError:
+            return None
+        return usec / 1_000_000 / 2 if usec > 0 else None
+
+
+class HealthMonitor:
+    """Event-loop lag probe and background sampler heartbeat"""
+
+    def __init__(self, sampler_timeout: Optional[float] = None,
+                 max_loop_lag: float = WATCHDOG_MAX_LOOP_LAG):
+        self.sampler_timeout = sampler_timeout
+        self.max_loop_lag = max_loop_lag
+        self.loop_lag = 0.0  # Most recent probe
+        self.worst_lag = 0.0  # Worst probe since the last check
+        self.last_sample = time.monotonic()
+
+    async def probe_loop(self, interval: float = 1.0):
+        """Measure how late the event loop wakes up from a sleep"""
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(interval)
+            self.loop_lag = max(0.0, loop.time() - start - interval)
+            self.worst_lag = max(self.worst_lag, self.loop_lag)
+
+    def sampler_heartbeat(self):
+        """Called by the background sampler whenever a sample finishes, even with an error"""
+        self.last_sample = time.monotonic()
+
+    def check(self) -> Tuple[bool, str]:
+        """Return (healthy, reason) and start a new lag window"""
+        worst_lag, self.worst_lag = self.worst_lag, self.loop_lag
+
+        if worst_lag > self.max_loop_lag:
+            return False, f"event loop lag {worst_lag:.1f}s"
+
+        if self.sampler_timeout:
+            since_sample = time.monotonic() - self.last_sample
+            if since_sample > self.sampler_timeout:
+                return False, f"sampler stalled for {since_sample:.0f}s"
+
+        return True, "ok"
+
+    def get_sampler_age(self) -> float:
+        return time.monotonic() - self.last_sample
@@ -1,14 +1,102 @@
 # modules/temperature_monitor.py
 import subprocess
 import logging
-from typing import Dict, Optional
-from config.config import TEMP_WARNING_THRESHOLD, TEMP_CRITICAL_THRESHOLD
+import time
+import threading
+from collections import deque
+from typing import Dict, Optional, Tuple
+from config.config import (
+    TEMP_PREDICT_HORIZON,
+    TEMP_TREND_WINDOW, TEMP_TREND_MIN_SAMPLES, TEMP_RISING_RATE,
+    TEMP_SAMPLE_FAST, TEMP_SAMPLE_NORMAL, TEMP_SAMPLE_SLOW
+)
+from modules.snapshots import ThermalSnapshot
+from modules.runtime_config import get_config
 
 logger = logging.getLogger(__name__)
 
+class ThermalTrend:
+    """Rolling linear regression over recent CPU temperature samples"""
+    
+    def __init__(self, window: float = TEMP_TREND_WINDOW):
+        self.window = window
+        self.samples = deque()  # (monotonic time, temperature)
+        self.lock = threading.Lock()  # Sampled from the event loop and worker threads
+    
+    def add_sample(self, temp: float, now: Optional[float] = None):
+        """Record a temperature sample and drop samples outside the window"""
+        now = time.monotonic() if now is None else now
+        with self.lock:
+            self.samples.append((now, temp))
+            while self.samples and now - self.samples[0][0] > self.window:
+                self.samples.popleft()
+    
+    def get_samples(self) -> Tuple[Tuple[float, float], ...]:
+        """Consistent copy of the current samples"""
+        with self.lock:
+            return tuple(self.samples)
+    
+    def get_slope(self, samples: Optional[Tuple] = None) -> Optional[float]:
+        """Least-squares slope in Celsius per second, None if not enough data"""
+        samples = self.get_samples() if samples is None else samples
+        n = len(samples)
+        if n < 2:
+            return None
+        
+        t0 = samples[0][0]
+        mean_t = sum(t - t0 for t, _ in samples) / n
+        mean_y = sum(y for _, y in samples) / n
+        var_t = sum((t - t0 - mean_t) ** 2 for t, _ in samples)
+        if var_t == 0:
+            return None
+        
+        cov = sum((t - t0 - mean_t) * (y - mean_y) for t, y in samples)
+        return cov / var_t
+    
+    def get_time_to_critical(self, samples: Optional[Tuple] = None) -> Optional[float]:
+        """Estimated seconds until the critical threshold, None if not heading there"""
+        samples = self.get_samples() if samples is None else samples
+        if len(samples) < TEMP_TREND_MIN_SAMPLES:
+            return None
+        
+        slope = self.get_slope(samples)
+        if not slope or slope <= 0:
+            return None
+        
+        critical = get_config().temp_critical
+        current = samples[-1][1]
+        if current >= critical:
+            return 0.0
+        return (critical - current) / slope
+    
+    def is_rising(self, samples: Optional[Tuple] = None) -> bool:
+        """Check if temperature is rising faster than TEMP_RISING_RATE"""
+        slope = self.get_slope(samples)
+        return slope is not None and slope * 60 >= TEMP_RISING_RATE
+    
+    def get_next_interval(self) -> int:
+        """Seconds until the next check: faster while hot or rising, slower when cool"""
+        samples = self.get_samples()
+        if not samples:
+            return TEMP_SAMPLE_NORMAL
+        
+        warning = get_config().temp_warning
+        current = samples[-1][1]
+        if current >= warning or self.is_rising(samples):
+            return TEMP_SAMPLE_FAST
+        
+        time_to_critical = self.get_time_to_critical(samples)
+        if time_to_critical is not None and time_to_critical < TEMP_PREDICT_HORIZON * 2:
+            return TEMP_SAMPLE_FAST
+        
+        if current >= warning - 10:
+            return TEMP_SAMPLE_NORMAL
+        return TEMP_SAMPLE_SLOW
+
 class TemperatureMonitor:
     def __init__(self):
         self.last_temp = 0.0
+        self.trend = ThermalTrend()
         
     def get_cpu_temperature(self) -> Optional[float]:
         """Get CPU temperature from vcgencmd or thermal zone"""
@@ -25,7 +113,7 @@ class TemperatureMonitor:
                 # Extract temperature from "temp=XX.X'C"
                 temp = float(temp_str.split('=')[1].split("'")[0])
                 return temp
-        except (subprocess.TimeoutExpired, subprocess.CalledProcessError, ValueError, IndexError):
+        except (subprocess.TimeoutExpired, subprocess.CalledProcessError, FileNotFoundError, ValueError, IndexError):
             pass
             
         try:
@@ -40,6 +128,13 @@ class TemperatureMonitor:
         logger.error("Unable to read CPU temperature")
         return None
     
+    def get_recent_temperature(self, max_age: float) -> Optional[float]:
+        """Latest trend sample if it is recent enough, without reading the sensor"""
+        samples = self.trend.get_samples()
+        if samples and time.monotonic() - samples[-1][0] <= max_age:
+            return samples[-1][1]
+        return None
+    
     def get_gpu_temperature(self) -> Optional[float]:
         """Get GPU temperature (Raspberry Pi specific)"""
         try:
@@ -53,37 +148,46 @@ class TemperatureMonitor:
                 temp_str = result.stdout.strip()
                 temp = float(temp_str.split('=')[1].split("'")[0])
                 return temp
-        except (subprocess.TimeoutExpired, subprocess.CalledProcessError, ValueError, IndexError):
+        except (subprocess.TimeoutExpired, subprocess.CalledProcessError, FileNotFoundError, ValueError, IndexError):
             pass
         return None
     
-    def get_temperature_status(self) -> Dict:
+    def get_temperature_status(self) -> ThermalSnapshot:
         """Get comprehensive temperature status"""
         cpu_temp = self.get_cpu_temperature()
         gpu_temp = self.get_gpu_temperature()
         
-        status = {
-            'cpu_temp': cpu_temp,
-            'gpu_temp': gpu_temp,
-            'status': 'unknown',
-            'warning': False,
-            'critical': False
-        }
+        if cpu_temp is None:
+            return ThermalSnapshot(
+                timestamp=time.time(),
+                gpu_temp=gpu_temp,
+                error="Unable to read CPU temperature"
+            )
         
-        if cpu_temp is not None:
-            self.last_temp = cpu_temp
-            
-            if cpu_temp >= TEMP_CRITICAL_THRESHOLD:
-                status['status'] = 'critical'
-                status['critical'] = True
-                status['warning'] = True
-            elif cpu_temp >= TEMP_WARNING_THRESHOLD:
-                status['status'] = 'warning'
-                status['warning'] = True
-            else:
-                status['status'] = 'normal'
-        
-        return status
+        self.last_temp = cpu_temp
+        self.trend.add_sample(cpu_temp)
+        
+        samples = self.trend.get_samples()
+        slope = self.trend.get_slope(samples)
+        config = get_config()
+        
+        if cpu_temp >= config.temp_critical:
+            status = 'critical'
+        elif cpu_temp >= config.temp_warning:
+            status = 'warning'
+        else:
+            status = 'normal'
+        
+        return ThermalSnapshot(
+            timestamp=time.time(),
+            cpu_temp=cpu_temp,
+            gpu_temp=gpu_temp,
+            status=status,
+            warning=cpu_temp >= config.temp_warning,
+            critical=cpu_temp >= config.temp_critical,
+            trend=slope * 60 if slope is not None else None,  # Celsius per minute
+            time_to_critical=self.trend.get_time_to_critical(samples)
+        )
     
     def get_thermal_throttling_status(self) -> Dict:
         """Check thermal throttling status"""
@@ -109,27 +213,34 @@ class TemperatureMonitor:
                     'throttling_occurred': bool(throttled_int & 0x40000),
                     'soft_temperature_limit_occurred': bool(throttled_int & 0x80000)
                 }
-        except (subprocess.TimeoutExpired, subprocess.CalledProcessError, ValueError, IndexError):
+        except (subprocess.TimeoutExpired, subprocess.CalledProcessError, FileNotFoundError, ValueError, IndexError):
             pass
         
         return {}
     
     def format_temperature_report(self) -> str:
         """Format a comprehensive temperature report"""
-        temp_status = self.get_temperature_status()
+        thermal = self.get_temperature_status()
         throttle_status = self.get_thermal_throttling_status()
         
         report = "🌡️ **Temperature Report**\n\n"
         
-        if temp_status['cpu_temp'] is not None:
-            cpu_temp = temp_status['cpu_temp']
-            temp_emoji = "🔥" if temp_status['critical'] else "⚠️" if temp_status['warning'] else "✅"
-            report += f"{temp_emoji} **CPU Temperature:** {cpu_temp:.1f}°C\n"
+        if thermal.cpu_temp is not None:
+            temp_emoji = "🔥" if thermal.critical else "⚠️" if thermal.warning else "✅"
+            report += f"{temp_emoji} **CPU Temperature:** {thermal.cpu_temp:.1f}°C\n"
+        
+        if thermal.gpu_temp is not None:
+            report += f"🎮 **GPU Temperature:** {thermal.gpu_temp:.1f}°C\n"
+        
+        report += f"📊 **Status:** {thermal.status.upper()}\n"
+        
+        if thermal.trend is not None:
+            report += f"📈 **Trend:** {thermal.trend:+.2f}°C/min\n"
         
-        if temp_status['gpu_temp'] is not None:
-            report += f"🎮 **GPU Temperature:** {temp_status['gpu_temp']:.1f}°C\n"
+        if thermal.time_to_critical is not None and not thermal.critical:
+            report += f"⏳ **Critical in:** ~{thermal.time_to_critical / 60:.0f} min\n"
         
-        report += f"📊 **Status:** {temp_status['status'].upper()}\n\n"
+        report += "\n"
         
         if throttle_status:
             report += "🔧 **Throttling Status:**\n"